@@ -2,10 +2,17 @@
 Architecture BDI (Belief-Desire-Intention) de base pour tous les agents
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, ClassVar, Dict, List, Set
 from dataclasses import dataclass, field
 from enum import Enum
+from operator import attrgetter
+import sys
 import uuid
+import numpy as np
+
+
+# Clé de tri des désirs (construite une seule fois)
+_prio_key = attrgetter('priority')
 
 
 class BeliefType(Enum):
@@ -19,6 +26,11 @@ class BeliefType(Enum):
     DESTINATION = "destination"
 
 
+# Indice de chaque type de croyance dans les tableaux SoA de BDIAgent
+_BELIEF_TYPES = tuple(BeliefType)
+_BELIEF_INDEX = {belief_type: i for i, belief_type in enumerate(_BELIEF_TYPES)}
+
+
 class DesireType(Enum):
     """Types de désirs possibles"""
     REACH_DESTINATION = "reach_destination"
@@ -41,7 +53,18 @@ class IntentionType(Enum):
     DECELERATE = "decelerate"
 
 
-@dataclass
+def register(intention_type: IntentionType) -> Callable:
+    """
+    Décorateur : déclare une méthode handler(self, intention) -> bool
+    comme exécutant le type d'intention donné (voir BDIAgent._handlers)
+    """
+    def decorator(func: Callable) -> Callable:
+        func._intention_type = intention_type
+        return func
+    return decorator
+
+
+@dataclass(slots=True)
 class Belief:
     """Représente une croyance d'un agent"""
     type: BeliefType
@@ -55,7 +78,7 @@ class Belief:
         return (current_time - self.timestamp) < validity_duration
 
 
-@dataclass
+@dataclass(slots=True)
 class Desire:
     """Représente un désir d'un agent"""
     type: DesireType
@@ -69,7 +92,7 @@ class Desire:
         return self.satisfied
 
 
-@dataclass
+@dataclass(slots=True)
 class Intention:
     """Représente une intention d'un agent"""
     type: IntentionType
@@ -89,12 +112,33 @@ class BDIAgent(ABC):
     Classe de base pour tous les agents utilisant l'architecture BDI
     """
     
+    # Table de dispatch {IntentionType: handler}, construite une seule fois
+    # à la définition de chaque sous-classe à partir des méthodes @register
+    _handlers: ClassVar[Dict[IntentionType, Callable]] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers = dict(cls._handlers)
+        for attr in cls.__dict__.values():
+            intention_type = getattr(attr, '_intention_type', None)
+            if intention_type is not None:
+                handlers[intention_type] = attr
+        cls._handlers = handlers
+    
     def __init__(self, unique_id: str, model: Any):
-        self.unique_id = unique_id if unique_id else str(uuid.uuid4())
+        # Identifiant interné : hachage mis en cache et comparaison par pointeur
+        # (get_agent_by_id, routage des messages)
+        self.unique_id = sys.intern(unique_id if unique_id else str(uuid.uuid4()))
         self.model = model
         
         # Composants BDI
-        self.beliefs: Dict[BeliefType, Belief] = {}
+        # Croyances en SoA : un emplacement par BeliefType (type = -1 si absente)
+        n_beliefs = len(_BELIEF_TYPES)
+        self._belief_type = np.full(n_beliefs, -1, dtype=np.int32)
+        self._belief_ts = np.zeros(n_beliefs, dtype=np.float64)
+        self._belief_conf = np.ones(n_beliefs, dtype=np.float64)
+        self._belief_values: List[Any] = [None] * n_beliefs
+        self._belief_src: List[str] = ["self"] * n_beliefs
         self.desires: List[Desire] = []
         self.intentions: List[Intention] = []
         
@@ -116,31 +160,45 @@ class BDIAgent(ABC):
         """
         pass
     
+    @property
+    def beliefs(self) -> Dict[BeliefType, Belief]:
+        """Vue {BeliefType: Belief} des croyances présentes (reconstruite à la demande)"""
+        return {
+            _BELIEF_TYPES[i]: Belief(
+                type=_BELIEF_TYPES[i],
+                value=self._belief_values[i],
+                confidence=float(self._belief_conf[i]),
+                timestamp=float(self._belief_ts[i]),
+                source=self._belief_src[i]
+            )
+            for i in np.flatnonzero(self._belief_type >= 0).tolist()
+        }
+    
     def update_belief(self, belief_type: BeliefType, value: Any, 
                      confidence: float = 1.0, source: str = "self"):
         """Ajoute ou met à jour une croyance"""
-        self.beliefs[belief_type] = Belief(
-            type=belief_type,
-            value=value,
-            confidence=confidence,
-            timestamp=self.current_time,
-            source=source
-        )
+        i = _BELIEF_INDEX[belief_type]
+        self._belief_type[i] = i
+        self._belief_ts[i] = self.current_time
+        self._belief_conf[i] = confidence
+        self._belief_values[i] = value
+        self._belief_src[i] = source
     
     def get_belief(self, belief_type: BeliefType) -> Any:
         """Récupère la valeur d'une croyance"""
-        belief = self.beliefs.get(belief_type)
-        return belief.value if belief else None
+        return self._belief_values[_BELIEF_INDEX[belief_type]]
+    
+    def valid_beliefs_mask(self, validity_duration: float = 10.0) -> np.ndarray:
+        """Masque des croyances présentes et encore valides (une seule comparaison vectorisée)"""
+        return (self._belief_type >= 0) & ((self.current_time - self._belief_ts) < validity_duration)
     
     def remove_outdated_beliefs(self, validity_duration: float = 10.0):
         """Supprime les croyances obsolètes"""
-        to_remove = []
-        for belief_type, belief in self.beliefs.items():
-            if not belief.is_valid(self.current_time, validity_duration):
-                to_remove.append(belief_type)
-        
-        for belief_type in to_remove:
-            del self.beliefs[belief_type]
+        outdated = (self._belief_type >= 0) & ~self.valid_beliefs_mask(validity_duration)
+        if outdated.any():
+            self._belief_type[outdated] = -1
+            for i in np.flatnonzero(outdated).tolist():
+                self._belief_values[i] = None
     
     # ============ DESIRE MANAGEMENT ============
     
@@ -166,7 +224,7 @@ class BDIAgent(ABC):
         """Filtre les désirs conflictuels ou satisfaits"""
         self.desires = [d for d in self.desires if not d.satisfied]
         # Trier par priorité
-        self.desires.sort(key=lambda d: d.priority, reverse=True)
+        self.desires.sort(key=_prio_key, reverse=True)
     
     # ============ INTENTION MANAGEMENT ============
     
@@ -7,7 +7,7 @@ from enum import Enum
 import numpy as np
 from .bdi_agent import (
     BDIAgent, Belief, Desire, Intention,
-    BeliefType, DesireType, IntentionType
+    BeliefType, DesireType, IntentionType, register
 )
 
 
@@ -19,6 +19,9 @@ class EmergencyVehicleType(Enum):
     POLICE = "police"
 
 
+_EMERGENCY_TYPES = frozenset(e.value for e in EmergencyVehicleType)
+
+
 class CrisisManagerAgent(BDIAgent):
     """
     Agent Gestionnaire de Crise
@@ -90,9 +93,7 @@ class CrisisManagerAgent(BDIAgent):
         from .vehicle_agent import VehicleAgent
         for agent in self.model.schedule.agents:
             if isinstance(agent, VehicleAgent) and agent.active:
-                if hasattr(agent, 'vehicle_type') and agent.vehicle_type in [
-                    e.value for e in EmergencyVehicleType
-                ]:
+                if getattr(agent, 'vehicle_type', None) in _EMERGENCY_TYPES:
                     self.emergency_vehicles.append({
                         'id': agent.unique_id,
                         'type': agent.vehicle_type,
@@ -180,7 +181,6 @@ class CrisisManagerAgent(BDIAgent):
                 type=IntentionType.BROADCAST_CONGESTION,
                 priority=1.0,
                 parameters={
-                    'action': 'create_green_wave',
                     'vehicle_id': ev['id'],
                     'vehicle_type': ev['type'],
                     'vehicle_position': ev['position'],
@@ -197,7 +197,6 @@ class CrisisManagerAgent(BDIAgent):
                 type=IntentionType.NEGOTIATE_WITH_NEIGHBOR,
                 priority=0.8,
                 parameters={
-                    'action': 'delegate_priority',
                     'congested': congestion_info['congested_intersections']
                 },
                 parent_desire=DesireType.COORDINATE_WITH_NEIGHBORS
@@ -209,21 +208,26 @@ class CrisisManagerAgent(BDIAgent):
     
     def execute_intention(self, intention: Intention) -> bool:
         """Exécute une intention spécifique"""
-        try:
-            action = intention.parameters.get('action', '')
-            
-            if action == 'create_green_wave':
-                return self._create_green_wave(intention.parameters)
-            
-            elif action == 'delegate_priority':
-                return self._delegate_priority_via_cnp(intention.parameters)
-            
+        handler = self._handlers.get(intention.type)
+        if handler is None:
             return False
+        try:
+            return handler(self, intention)
         
         except Exception as e:
             print(f"Erreur CrisisManager - intention {intention.type}: {e}")
             return False
     
+    # ============ INTENTION HANDLERS ============
+    
+    @register(IntentionType.BROADCAST_CONGESTION)
+    def _handle_green_wave(self, intention: Intention) -> bool:
+        return self._create_green_wave(intention.parameters)
+    
+    @register(IntentionType.NEGOTIATE_WITH_NEIGHBOR)
+    def _handle_delegate_priority(self, intention: Intention) -> bool:
+        return self._delegate_priority_via_cnp(intention.parameters)
+    
     def _create_green_wave(self, params: Dict) -> bool:
         """
         Crée une vague verte sur le trajet d'un véhicule d'urgence.
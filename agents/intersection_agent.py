@@ -1,13 +1,15 @@
 """
 Agent Intersection (AI) - Gère un carrefour avec feux de signalisation
 """
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Hashable
+from collections.abc import Mapping, MutableMapping
 from enum import Enum
 import numpy as np
 from .bdi_agent import (
     BDIAgent, Belief, Desire, Intention,
-    BeliefType, DesireType, IntentionType
+    BeliefType, DesireType, IntentionType, register
 )
+from .intersection_agent_numba import bellman_update
 
 
 class TrafficLightState(Enum):
@@ -25,6 +27,129 @@ class Direction(Enum):
     WEST = "west"
 
 
+# Indice de chaque direction / code de chaque état de feu dans les tableaux NumPy
+_DIRECTION_INDEX = {direction: i for i, direction in enumerate(Direction)}
+_LIGHT_STATES = tuple(TrafficLightState)
+_LIGHT_CODE = {state: i for i, state in enumerate(_LIGHT_STATES)}
+_GREEN = _LIGHT_CODE[TrafficLightState.GREEN]
+
+
+class _DictProxy(MutableMapping):
+    """
+    Vue dict {Direction: valeur} sur un ndarray de taille fixe indexé par direction.
+    Seules les directions présentes (configurées) sont exposées comme clés.
+    """
+    
+    __slots__ = ('array', '_keys', '_decode', '_encode')
+    
+    def __init__(self, array: np.ndarray, decode: tuple = None, encode: dict = None):
+        self.array = array
+        self._keys: List[Direction] = []
+        self._decode = decode
+        self._encode = encode
+    
+    def __getitem__(self, direction: Direction):
+        if direction not in self._keys:
+            raise KeyError(direction)
+        value = self.array[_DIRECTION_INDEX[direction]]
+        return self._decode[value] if self._decode is not None else int(value)
+    
+    def __setitem__(self, direction: Direction, value):
+        if direction not in self._keys:
+            self._keys.append(direction)
+        self.array[_DIRECTION_INDEX[direction]] = (
+            self._encode[value] if self._encode is not None else value
+        )
+    
+    def __delitem__(self, direction: Direction):
+        self._keys.remove(direction)
+        self.array[_DIRECTION_INDEX[direction]] = 0
+    
+    def __iter__(self):
+        return iter(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, direction) -> bool:
+        return direction in self._keys
+    
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+# Actions du Q-Learning et leur colonne dans la Q-table
+Q_ACTIONS = ('change', 'keep')
+_ACTION_INDEX = {action: i for i, action in enumerate(Q_ACTIONS)}
+
+
+class _QRowView(Mapping):
+    """Vue {action: valeur} sur une ligne de la Q-table"""
+    
+    __slots__ = ('_table', '_row')
+    
+    def __init__(self, table: '_QDictView', row: int):
+        self._table = table
+        self._row = row
+    
+    def __getitem__(self, action: str) -> float:
+        return float(self._table.array[self._row, _ACTION_INDEX[action]])
+    
+    def __setitem__(self, action: str, value: float):
+        self._table.array[self._row, _ACTION_INDEX[action]] = value
+    
+    def __iter__(self):
+        return iter(Q_ACTIONS)
+    
+    def __len__(self) -> int:
+        return len(Q_ACTIONS)
+
+
+class _QDictView(MutableMapping):
+    """
+    Q-table stockée dans un ndarray (n_states, n_actions), exposée comme un
+    dict {état: {action: valeur}}. Les états reçoivent un indice de ligne
+    à leur première apparition.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self.array = np.zeros((capacity, len(Q_ACTIONS)), dtype=np.float64)
+        self.index: Dict[Hashable, int] = {}
+    
+    def state_id(self, state: Hashable) -> int:
+        """Indice de ligne de l'état (créé à zéro si nécessaire)"""
+        row = self.index.get(state)
+        if row is None:
+            row = len(self.index)
+            if row >= self.array.shape[0]:
+                # Doubler la capacité
+                self.array = np.concatenate([self.array, np.zeros_like(self.array)])
+            self.array[row] = 0.0
+            self.index[state] = row
+        return row
+    
+    def __getitem__(self, state: Hashable) -> _QRowView:
+        return _QRowView(self, self.index[state])
+    
+    def __setitem__(self, state: Hashable, values: Dict[str, float]):
+        row = self.state_id(state)
+        for action, value in values.items():
+            self.array[row, _ACTION_INDEX[action]] = value
+    
+    def __delitem__(self, state: Hashable):
+        # La ligne n'est pas réutilisée : seul l'indice est retiré
+        del self.index[state]
+    
+    def __iter__(self):
+        return iter(self.index)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __contains__(self, state) -> bool:
+        return state in self.index
+
+
 class IntersectionAgent(BDIAgent):
     """
     Agent représentant une intersection avec feux de signalisation
@@ -65,7 +190,9 @@ class IntersectionAgent(BDIAgent):
         self.congestion_threshold = 10
         
         # État des feux pour chaque direction
-        self.traffic_lights: Dict[Direction, TrafficLightState] = {}
+        # OPTIMISATION: feux et files stockés dans des ndarray (un octet/entier par direction)
+        self._lights = np.zeros(len(Direction), dtype=np.int8)
+        self.traffic_lights = _DictProxy(self._lights, decode=_LIGHT_STATES, encode=_LIGHT_CODE)
         self.light_timers: Dict[Direction, float] = {}
         self.green_durations: Dict[Direction, float] = {}
         
@@ -74,7 +201,10 @@ class IntersectionAgent(BDIAgent):
         
         # Files d'attente par direction
         self.queues: Dict[Direction, List] = {d: [] for d in directions}
-        self.queue_lengths: Dict[Direction, int] = {d: 0 for d in directions}
+        self._queues = np.zeros(len(Direction), dtype=np.int32)
+        self.queue_lengths = _DictProxy(self._queues)
+        for d in directions:
+            self.queue_lengths[d] = 0
         
         # Capteurs virtuels
         self.vehicle_counts: Dict[Direction, int] = {d: 0 for d in directions}
@@ -92,7 +222,7 @@ class IntersectionAgent(BDIAgent):
         self._neighbor_sync_interval: float = 10.0 # secondes entre deux diffusions d'état
         
         # Q-Learning pour optimisation
-        self.q_table: Dict = {}
+        self.q_table = _QDictView()
         self.learning_rate = 0.1
         self.discount_factor = 0.9
         self.epsilon = 0.1  # exploration vs exploitation
@@ -100,7 +230,7 @@ class IntersectionAgent(BDIAgent):
         self.epsilon_min = 0.01
         
         # Suivi état/action précédents pour mise à jour Q-Learning
-        self.previous_state: str = None
+        self.previous_state: Optional[int] = None
         self.previous_action: str = None
         self.previous_total_waiting: float = 0.0
         
@@ -141,10 +271,10 @@ class IntersectionAgent(BDIAgent):
         
         # Mettre à jour les longueurs de file
         for direction in self.directions:
-            self.queue_lengths[direction] = len(self.queues[direction])
+            self._queues[_DIRECTION_INDEX[direction]] = len(self.queues[direction])
         
         # Évaluer le niveau de congestion
-        max_queue = max(self.queue_lengths.values()) if self.queue_lengths else 0
+        max_queue = int(self._queues.max())
         
         if max_queue > self.congestion_threshold * 1.5:
             congestion_level = "fort"
@@ -295,11 +425,10 @@ class IntersectionAgent(BDIAgent):
             return False
 
         # État actuel
-        state = self._get_state_representation()
+        state = self._get_state_id()
         
         # Initialiser l'état dans la Q-table si nécessaire
-        if state not in self.q_table:
-            self.q_table[state] = {'change': 0.0, 'keep': 0.0}
+        state_id = self.q_table.state_id(state)
         
         # Mise à jour Q-table basée sur l'état/action précédents (Bellman)
         if self.previous_state is not None and self.previous_action is not None:
@@ -312,13 +441,13 @@ class IntersectionAgent(BDIAgent):
             action = 'change' if np.random.random() < 0.5 else 'keep'
         else:
             # Exploitation : meilleure action
-            q_values = self.q_table[state]
-            action = 'change' if q_values['change'] > q_values['keep'] else 'keep'
+            q_values = self.q_table.array[state_id]
+            action = 'change' if q_values[0] > q_values[1] else 'keep'
         
         # Sauvegarder l'état/action pour la prochaine mise à jour
         self.previous_state = state
         self.previous_action = action
-        self.previous_total_waiting = sum(self.queue_lengths.values())
+        self.previous_total_waiting = int(self._queues.sum())
         
         # Décroissance de epsilon
         self.epsilon = max(self.epsilon * self.epsilon_decay, self.epsilon_min)
@@ -330,13 +459,13 @@ class IntersectionAgent(BDIAgent):
         Calcule la récompense pour l'apprentissage par renforcement.
         Récompense positive si le temps d'attente diminue, négative sinon.
         """
-        current_total_waiting = sum(self.queue_lengths.values())
+        current_total_waiting = int(self._queues.sum())
         
         # Récompense basée sur la réduction des files d'attente
         waiting_diff = self.previous_total_waiting - current_total_waiting
         
         # Pénalité pour les files très longues
-        max_queue = max(self.queue_lengths.values()) if self.queue_lengths else 0
+        max_queue = int(self._queues.max())
         congestion_penalty = -0.5 * max(0, max_queue - self.congestion_threshold)
         
         # Bonus pour un débit élevé (véhicules traités)
@@ -345,26 +474,18 @@ class IntersectionAgent(BDIAgent):
         reward = waiting_diff + congestion_penalty + throughput_bonus
         return reward
     
-    def _update_q_table(self, state: str, action: str, reward: float, next_state: str):
+    def _update_q_table(self, state: Hashable, action: str, reward: float, next_state: Hashable):
         """
         Met à jour la Q-table avec l'équation de Bellman :
         Q(s,a) = Q(s,a) + α * [R + γ * max(Q(s',a')) - Q(s,a)]
         """
-        # Initialiser le nouvel état si nécessaire
-        if next_state not in self.q_table:
-            self.q_table[next_state] = {'change': 0.0, 'keep': 0.0}
-        
-        # Valeur Q actuelle
-        current_q = self.q_table[state][action]
+        # Indices de ligne (le nouvel état est initialisé si nécessaire)
+        s = self.q_table.state_id(state)
+        sp = self.q_table.state_id(next_state)
         
-        # Meilleure valeur Q pour l'état suivant
-        max_next_q = max(self.q_table[next_state].values())
-        
-        # Équation de Bellman
-        new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
-        
-        # Mise à jour
-        self.q_table[state][action] = new_q
+        # Équation de Bellman (noyau compilé si Numba est disponible)
+        bellman_update(self.q_table.array, s, _ACTION_INDEX[action], float(reward), sp,
+                       self.learning_rate, self.discount_factor)
     
     def _max_pressure_decision(self) -> bool:
         """
@@ -464,42 +585,66 @@ class IntersectionAgent(BDIAgent):
             # Si le feu est rouge, estimation neutre
             return 5.0
     
-    def _get_state_representation(self) -> str:
-        """Représentation de l'état pour Q-Learning"""
+    def _discretize_state(self) -> Tuple[int, int, bool]:
+        """État discrétisé : (queue_NS, queue_EW, phase NS au vert)"""
         # Simplification : état = (queue_NS, queue_EW, current_phase)
-        ns_queue = sum(self.queue_lengths.get(d, 0) for d in [Direction.NORTH, Direction.SOUTH])
-        ew_queue = sum(self.queue_lengths.get(d, 0) for d in [Direction.EAST, Direction.WEST])
+        q = self._queues
+        ns_queue = int(q[_DIRECTION_INDEX[Direction.NORTH]] + q[_DIRECTION_INDEX[Direction.SOUTH]])
+        ew_queue = int(q[_DIRECTION_INDEX[Direction.EAST]] + q[_DIRECTION_INDEX[Direction.WEST]])
         
-        current_phase = "NS" if self.traffic_lights.get(Direction.NORTH) == TrafficLightState.GREEN else "EW"
+        ns_green = Direction.NORTH in self.traffic_lights and \
+            self._lights[_DIRECTION_INDEX[Direction.NORTH]] == _GREEN
         
         # Discrétiser les queues
         ns_discrete = min(ns_queue // 3, 5)  # 0-5
         ew_discrete = min(ew_queue // 3, 5)
         
+        return int(ns_discrete), int(ew_discrete), ns_green
+    
+    def _get_state_id(self) -> int:
+        """
+        Identifiant entier de l'état pour la Q-table (clé de hachage sans allocation).
+        Bits 0-2 : queue NS, bits 3-5 : queue EW, bit 6 : phase (1 = NS au vert)
+        """
+        ns_discrete, ew_discrete, ns_green = self._discretize_state()
+        return ns_discrete | (ew_discrete << 3) | (int(ns_green) << 6)
+    
+    def _get_state_representation(self) -> str:
+        """Représentation lisible de l'état pour Q-Learning (journalisation)"""
+        ns_discrete, ew_discrete, ns_green = self._discretize_state()
+        current_phase = "NS" if ns_green else "EW"
         return f"{ns_discrete}_{ew_discrete}_{current_phase}"
     
     # ============ INTENTION EXECUTION ============
     
     def execute_intention(self, intention: Intention) -> bool:
         """Exécute une intention spécifique"""
-        try:
-            if intention.type == IntentionType.CHANGE_LIGHT_TIMING:
-                return self._change_traffic_light_phase()
-            
-            elif intention.type == IntentionType.BROADCAST_CONGESTION:
-                congestion_level = intention.parameters.get('congestion_level', 0.5)
-                location = intention.parameters.get('location', self.position)
-                return self._broadcast_congestion_info(congestion_level, location)
-            
-            elif intention.type == IntentionType.NEGOTIATE_WITH_NEIGHBOR:
-                return self._broadcast_state_to_neighbors()
-            
+        handler = self._handlers.get(intention.type)
+        if handler is None:
             return False
+        try:
+            return handler(self, intention)
         
         except Exception as e:
             print(f"Erreur lors de l'exécution de l'intention {intention.type}: {e}")
             return False
     
+    # ============ INTENTION HANDLERS ============
+    
+    @register(IntentionType.CHANGE_LIGHT_TIMING)
+    def _handle_change_light_timing(self, intention: Intention) -> bool:
+        return self._change_traffic_light_phase()
+    
+    @register(IntentionType.BROADCAST_CONGESTION)
+    def _handle_broadcast_congestion(self, intention: Intention) -> bool:
+        congestion_level = intention.parameters.get('congestion_level', 0.5)
+        location = intention.parameters.get('location', self.position)
+        return self._broadcast_congestion_info(congestion_level, location)
+    
+    @register(IntentionType.NEGOTIATE_WITH_NEIGHBOR)
+    def _handle_negotiate(self, intention: Intention) -> bool:
+        return self._broadcast_state_to_neighbors()
+    
     def _change_traffic_light_phase(self) -> bool:
         """Change la phase des feux de signalisation.
         Si une onde verte a mémorisé une phase cible, elle est appliquée
@@ -877,7 +1022,7 @@ class IntersectionAgent(BDIAgent):
         target_direction = message.content.get("direction")
         
         # Évaluer la capacité à prendre en charge la tâche
-        current_load = sum(self.queue_lengths.values())
+        current_load = int(self._queues.sum())
         max_capacity = self.congestion_threshold * len(self.directions)
         availability = 1.0 - (current_load / max(max_capacity, 1))
         
@@ -0,0 +1,32 @@
+"""
+Noyaux compilés (Numba) pour le Q-Learning des agents intersection
+Si Numba n'est pas installé, les fonctions s'exécutent en Python pur.
+"""
+import numpy as np
+
+# Import optionnel de Numba
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Remplaçant sans compilation de numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def bellman_update(Q: np.ndarray, s: int, a: int, r: float, sp: int,
+                   alpha: float, gamma: float) -> float:
+    """
+    Mise à jour de Bellman en place sur la Q-table (n_states, n_actions) :
+    Q(s,a) = Q(s,a) + α * [R + γ * max(Q(s',a')) - Q(s,a)]
+
+    Returns:
+        La nouvelle valeur Q(s,a)
+    """
+    Q[s, a] += alpha * (r + gamma * Q[sp].max() - Q[s, a])
+    return Q[s, a]
@@ -3,12 +3,23 @@ Agent Véhicule (AV) - Représente un véhicule autonome dans la simulation
 """
 import math
 from typing import Tuple, List, Optional
+import numpy as np
 from .bdi_agent import (
     BDIAgent, Belief, Desire, Intention,
-    BeliefType, DesireType, IntentionType
+    BeliefType, DesireType, IntentionType, register
 )
 
 
+def distance_batch(P, Q) -> np.ndarray:
+    """
+    Distances euclidiennes ligne à ligne entre deux tableaux (N, 2).
+    Q peut aussi être un point unique (2,), diffusé sur toutes les lignes de P.
+    """
+    D = np.asarray(P, dtype=np.float64) - np.asarray(Q, dtype=np.float64)
+    D = np.atleast_2d(D)
+    return np.sqrt(np.einsum('ij,ij->i', D, D))
+
+
 class VehicleAgent(BDIAgent):
     """
     Agent représentant un véhicule dans le système de trafic
@@ -64,6 +75,9 @@ class VehicleAgent(BDIAgent):
         self.route_changes = 0
         self.stops_count = 0
         
+        # Ligne du véhicule dans les tableaux SoA du modèle (None hors du modèle)
+        self._slot: Optional[int] = None
+        
         # Initialiser les croyances de base
         self._initialize_beliefs()
     
@@ -109,18 +123,18 @@ class VehicleAgent(BDIAgent):
         # Mettre à jour le cache seulement toutes les 10 secondes
         cache_interval = 10.0
         if self.current_time - self._nearby_cache_time >= cache_interval:
-            nearby = []
             # Parcourir les agents (simplifié pour éviter les bugs)
             try:
-                for agent in self.model.schedule.agents:
-                    if isinstance(agent, VehicleAgent) and agent != self and agent.active:
-                        try:
-                            distance = self._calculate_distance(self.position, agent.position)
-                            if distance <= radius:
-                                nearby.append(agent)
-                        except:
-                            # Ignorer les agents avec des positions invalides
-                            continue
+                candidates = [
+                    agent for agent in self.model.schedule.agents
+                    if isinstance(agent, VehicleAgent) and agent != self and agent.active
+                ]
+                # OPTIMISATION: toutes les distances en un seul appel NumPy
+                if candidates:
+                    distances = distance_batch([agent.position for agent in candidates], self.position)
+                    nearby = [agent for agent, d in zip(candidates, distances.tolist()) if d <= radius]
+                else:
+                    nearby = []
             except:
                 # En cas d'erreur, retourner le cache existant
                 return self._nearby_cache
@@ -173,7 +187,12 @@ class VehicleAgent(BDIAgent):
     
     def _is_at_destination(self) -> bool:
         """Vérifie si le véhicule est arrivé à destination"""
-        distance = self._calculate_distance(self.position, self.destination)
+        slot = self._slot
+        if slot is not None and self.model.vehicle_fresh[slot]:
+            # Distance restante calculée en lot par le modèle pour ce step
+            distance = float(self.model.vehicle_remaining[slot])
+        else:
+            distance = self._calculate_distance(self.position, self.destination)
         return distance < 10.0  # Seuil de 10 mètres
     
     # ============ DELIBERATION ============
@@ -248,37 +267,50 @@ class VehicleAgent(BDIAgent):
     
     def execute_intention(self, intention: Intention) -> bool:
         """Exécute une intention spécifique"""
-        try:
-            if intention.type == IntentionType.MOVE_FORWARD:
-                return self._move_forward()
-            
-            elif intention.type == IntentionType.CHANGE_ROUTE:
-                return self._recalculate_route()
-            
-            elif intention.type == IntentionType.STOP:
-                return self._stop()
-            
-            elif intention.type == IntentionType.ACCELERATE:
-                target_speed = intention.parameters.get('target_speed', self.max_speed)
-                return self._accelerate(target_speed)
-            
-            elif intention.type == IntentionType.DECELERATE:
-                target_speed = intention.parameters.get('target_speed', 0.0)
-                return self._decelerate(target_speed)
-            
+        handler = self._handlers.get(intention.type)
+        if handler is None:
             return False
+        try:
+            return handler(self, intention)
         
         except Exception as e:
             print(f"Erreur lors de l'exécution de l'intention {intention.type}: {e}")
             return False
     
+    # ============ INTENTION HANDLERS ============
+    
+    @register(IntentionType.MOVE_FORWARD)
+    def _handle_move_forward(self, intention: Intention) -> bool:
+        return self._move_forward()
+    
+    @register(IntentionType.CHANGE_ROUTE)
+    def _handle_change_route(self, intention: Intention) -> bool:
+        return self._recalculate_route()
+    
+    @register(IntentionType.STOP)
+    def _handle_stop(self, intention: Intention) -> bool:
+        return self._stop()
+    
+    @register(IntentionType.ACCELERATE)
+    def _handle_accelerate(self, intention: Intention) -> bool:
+        return self._accelerate(intention.parameters.get('target_speed', self.max_speed))
+    
+    @register(IntentionType.DECELERATE)
+    def _handle_decelerate(self, intention: Intention) -> bool:
+        return self._decelerate(intention.parameters.get('target_speed', 0.0))
+    
     def _move_forward(self) -> bool:
         """Déplace le véhicule vers le prochain waypoint"""
         if not self.current_route or self.current_waypoint_index >= len(self.current_route):
             return False
         
         target = self.current_route[self.current_waypoint_index]
-        direction = self._get_direction_to(target)
+        slot = self._slot
+        if slot is not None and self.model.vehicle_fresh[slot]:
+            # Direction vers ce waypoint calculée en lot par le modèle
+            direction = self.model.vehicle_direction[slot].tolist()
+        else:
+            direction = self._get_direction_to(target)
         
         # Calculer la nouvelle position
         time_step = self.model.time_step if hasattr(self.model, 'time_step') else 1.0
@@ -301,8 +333,22 @@ class VehicleAgent(BDIAgent):
         if self._calculate_distance(self.position, target) < 5.0:
             self.current_waypoint_index += 1
         
+        self._sync_arrays()
         return True
     
+    def _sync_arrays(self):
+        """Reporte en place la position et le prochain waypoint dans les tableaux SoA du modèle"""
+        slot = self._slot
+        if slot is None:
+            return
+        model = self.model
+        model.vehicle_pos[slot] = self.position
+        if self.current_waypoint_index < len(self.current_route):
+            model.vehicle_target[slot] = self.current_route[self.current_waypoint_index]
+        else:
+            model.vehicle_target[slot] = self.position
+        model.vehicle_fresh[slot] = False
+    
     def _recalculate_route(self) -> bool:
         """
         Recalcule la route vers la destination.
@@ -348,6 +394,7 @@ class VehicleAgent(BDIAgent):
                 self.current_route = new_route
                 self.current_waypoint_index = 0
                 self.route_changes += 1
+                self._sync_arrays()
                 self.update_belief(BeliefType.ROUTE, self.current_route)
                 
                 # Enregistrer dans l'historique pour analyse
@@ -444,8 +491,22 @@ class VehicleAgent(BDIAgent):
     
     def _calculate_distance(self, pos1: Tuple[float, float], 
                            pos2: Tuple[float, float]) -> float:
-        """Calcule la distance euclidienne entre deux positions"""
-        return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
+        """
+        Calcule la distance euclidienne entre deux positions.
+        Pour de nombreux couples, utiliser distance_batch().
+        """
+        return math.hypot(pos1[0] - pos2[0], pos1[1] - pos2[1])
+    
+    @staticmethod
+    def _directions_batch(positions, targets) -> np.ndarray:
+        """
+        Vecteurs unitaires (N, 2) de chaque position vers sa cible.
+        Les lignes de longueur nulle donnent (0, 0).
+        """
+        delta = np.asarray(targets, dtype=np.float64) - np.asarray(positions, dtype=np.float64)
+        delta = np.atleast_2d(delta)
+        norm = np.linalg.norm(delta, axis=1, keepdims=True)
+        return np.divide(delta, norm, out=np.zeros_like(delta), where=norm > 0)
     
     def _get_direction_to(self, target: Tuple[float, float]) -> Tuple[float, float]:
         """Retourne le vecteur unitaire de direction vers la cible"""
@@ -2,15 +2,20 @@
 Algorithmes de routage pour les véhicules
 Implémentation de A* et Dijkstra
 """
+from functools import lru_cache
 import heapq
 import math
 from typing import Tuple, List, Dict, Set, Optional, Callable
+import numpy as np
 import networkx as nx
+from .routing_numba import astar_csr, NUMBA_AVAILABLE
 
 
 class Node:
     """Représente un nœud dans le graphe de routes"""
     
+    __slots__ = ('position', 'id', 'neighbors')
+    
     def __init__(self, position: Tuple[float, float], node_id: str = None):
         self.position = position
         self.id = node_id if node_id else f"{position[0]}_{position[1]}"
@@ -30,6 +35,34 @@ class Node:
         return self.id == other.id
 
 
+@lru_cache(maxsize=8)
+def _build_grid(width: int, height: int, cell_size: int) -> Tuple[tuple, tuple]:
+    """
+    Topologie d'une grille, mémoïsée (construction déterministe)
+
+    Returns:
+        (nœuds ((node_id, position), ...), arêtes ((id1, id2, poids), ...))
+    """
+    xs = range(0, width, cell_size)
+    ys = range(0, height, cell_size)
+    nodes = tuple((f"{x}_{y}", (x, y)) for x in xs for y in ys)
+    
+    edges = []
+    for x in xs:
+        for y in ys:
+            current_id = f"{x}_{y}"
+            
+            # Connecter à droite
+            if x + cell_size < width:
+                edges.append((current_id, f"{x + cell_size}_{y}", float(cell_size)))
+            
+            # Connecter en bas
+            if y + cell_size < height:
+                edges.append((current_id, f"{x}_{y + cell_size}", float(cell_size)))
+    
+    return nodes, tuple(edges)
+
+
 class RoadNetwork:
     """
     Représente le réseau routier
@@ -39,9 +72,12 @@ class RoadNetwork:
         self.nodes: Dict[str, Node] = {}
         self.graph = nx.Graph()
         self.grid_size = 100  # Taille de la grille pour discrétisation
+        self._csr = None  # Représentation CSR, invalidée à chaque modification
+        self._csr_index: Dict[str, int] = {}  # node_id -> indice CSR
     
     def add_node(self, node: Node):
         """Ajoute un nœud au réseau"""
+        self._csr = None
         self.nodes[node.id] = node
         self.graph.add_node(node.id, pos=node.position)
     
@@ -56,6 +92,7 @@ class RoadNetwork:
             pos2 = self.nodes[node2_id].position
             weight = self._euclidean_distance(pos1, pos2)
         
+        self._csr = None
         self.nodes[node1_id].add_neighbor(node2_id, weight)
         self.nodes[node2_id].add_neighbor(node1_id, weight)
         self.graph.add_edge(node1_id, node2_id, weight=weight)
@@ -68,27 +105,14 @@ class RoadNetwork:
         Utile pour la simulation urbaine
         """
         self.grid_size = cell_size
+        nodes, edges = _build_grid(width, height, cell_size)
         
-        # Créer les nœuds de la grille
-        for x in range(0, width, cell_size):
-            for y in range(0, height, cell_size):
-                node = Node((x, y))
-                self.add_node(node)
+        # Nœuds neufs à chaque appel : les voisins sont propres à ce réseau
+        for node_id, position in nodes:
+            self.add_node(Node(position, node_id))
         
-        # Connecter les nœuds adjacents
-        for x in range(0, width, cell_size):
-            for y in range(0, height, cell_size):
-                current_id = f"{x}_{y}"
-                
-                # Connecter à droite
-                if x + cell_size < width:
-                    right_id = f"{x + cell_size}_{y}"
-                    self.add_edge(current_id, right_id)
-                
-                # Connecter en bas
-                if y + cell_size < height:
-                    down_id = f"{x}_{y + cell_size}"
-                    self.add_edge(current_id, down_id)
+        for node1_id, node2_id, weight in edges:
+            self.add_edge(node1_id, node2_id, weight)
     
     def get_nearest_node(self, position: Tuple[float, float]) -> Optional[Node]:
         """Trouve le nœud le plus proche d'une position"""
@@ -117,6 +141,7 @@ class RoadNetwork:
     def remove_edge(self, node1_id: str, node2_id: str):
         """Supprime une arête (pour simuler des blocages)"""
         if node1_id in self.nodes and node2_id in self.nodes:
+            self._csr = None
             self.nodes[node1_id].neighbors.pop(node2_id, None)
             self.nodes[node2_id].neighbors.pop(node1_id, None)
             if self.graph.has_edge(node1_id, node2_id):
@@ -150,6 +175,35 @@ class RoadNetwork:
                 still_blocked.append((node1_id, node2_id, expiry))
         self._temporary_blockages = still_blocked
     
+    def to_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """
+        Représentation contiguë du graphe pour les noyaux compilés.
+        
+        Returns:
+            (indptr, neighbors, weights, coords, node_ids) : les voisins du nœud i
+            sont neighbors[indptr[i]:indptr[i+1]], coords[i] est sa position
+            et node_ids[i] son identifiant
+        """
+        if self._csr is None:
+            node_ids = list(self.nodes)
+            index = {node_id: i for i, node_id in enumerate(node_ids)}
+            
+            indptr = np.zeros(len(node_ids) + 1, dtype=np.int32)
+            neighbors: List[int] = []
+            weights: List[float] = []
+            for i, node_id in enumerate(node_ids):
+                for neighbor_id, weight in self.nodes[node_id].neighbors.items():
+                    neighbors.append(index[neighbor_id])
+                    weights.append(weight)
+                indptr[i + 1] = len(neighbors)
+            
+            coords = np.array([self.nodes[node_id].position for node_id in node_ids],
+                              dtype=np.float64).reshape(-1, 2)
+            self._csr_index = index
+            self._csr = (indptr, np.array(neighbors, dtype=np.int32),
+                         np.array(weights, dtype=np.float64), coords, node_ids)
+        return self._csr
+    
     @staticmethod
     def _euclidean_distance(pos1: Tuple[float, float], 
                            pos2: Tuple[float, float]) -> float:
@@ -207,9 +261,12 @@ class AStarRouter:
             self.cache_hits += 1
             path = self.route_cache[cache_key]
         else:
-            # A* Algorithm
+            # A* Algorithm (noyau CSR compilé si Numba est disponible)
             self.cache_misses += 1
-            path = self._a_star(start_node.id, end_node.id)
+            if NUMBA_AVAILABLE:
+                path = self._a_star_csr(start_node.id, end_node.id)
+            else:
+                path = self._a_star(start_node.id, end_node.id)
             
             # Ajouter au cache si trouvé
             if path:
@@ -301,6 +358,22 @@ class AStarRouter:
         # Pas de chemin trouvé
         return None
     
+    def _a_star_csr(self, start_id: str, end_id: str) -> Optional[List[str]]:
+        """
+        A* sur la représentation CSR du réseau (voir routing_numba.astar_csr).
+        
+        Returns:
+            Liste d'IDs de nœuds formant le chemin
+        """
+        indptr, neighbors, weights, coords, node_ids = self.network.to_csr()
+        index = self.network._csr_index
+        src, dst = index[start_id], index[end_id]
+        
+        path = astar_csr(indptr, neighbors, weights, coords, src, dst)
+        if len(path) == 0:
+            return None
+        return [node_ids[i] for i in path.tolist()]
+    
     def _reconstruct_path(self, came_from: Dict[str, str], current_id: str) -> List[str]:
         """Reconstruit le chemin depuis came_from"""
         path = [current_id]
@@ -6,6 +6,8 @@ ACL = Agent Communication Language
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 from enum import Enum
+import itertools
+import sys
 import time
 
 
@@ -44,7 +46,11 @@ class Performative(Enum):
     COORDINATE = "coordinate"  # Coordonner des actions
 
 
-@dataclass
+# Générateur d'identifiants de messages (entiers croissants, uniques dans le processus)
+_message_ids = itertools.count(1)
+
+
+@dataclass(slots=True)
 class FIPAMessage:
     """
     Message FIPA-ACL
@@ -71,15 +77,21 @@ class FIPAMessage:
     ontology: Optional[str] = None
     protocol: Optional[str] = None
     conversation_id: Optional[str] = None
-    reply_to: Optional[str] = None
+    reply_to: Optional[int] = None
     reply_by: Optional[float] = None
     
     # Métadonnées
     timestamp: float = field(default_factory=time.time)
-    message_id: str = field(default_factory=lambda: f"msg_{int(time.time() * 1000)}")
+    message_id: int = field(default_factory=_message_ids.__next__)
     
     def __post_init__(self):
         """Validation après initialisation"""
+        # Interner les identifiants d'agents (clés de routage fréquemment hachées)
+        if type(self.sender) is str:
+            self.sender = sys.intern(self.sender)
+        if type(self.receiver) is str:
+            self.receiver = sys.intern(self.receiver)
+        
         # Convertir le performative en enum si c'est une string
         if isinstance(self.performative, str):
             try:
@@ -114,7 +126,7 @@ class FIPAMessage:
         """Vérifie si c'est un message broadcast"""
         return self.receiver == "broadcast"
     
-    def is_reply_to(self, message_id: str) -> bool:
+    def is_reply_to(self, message_id: int) -> bool:
         """Vérifie si ce message est une réponse à un autre"""
         return self.reply_to == message_id
     
@@ -133,7 +145,7 @@ class FIPAMessage:
     
     def __repr__(self):
         return (f"FIPAMessage(sender={self.sender}, receiver={self.receiver}, "
-                f"performative={self.performative}, id={self.message_id})")
+                f"performative={self.performative}, id=msg_{self.message_id})")
 
 
 class MessageQueue:
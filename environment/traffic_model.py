@@ -12,7 +12,7 @@ from mesa.datacollection import DataCollector
 from datetime import datetime
 from loguru import logger
 
-from agents.vehicle_agent import VehicleAgent
+from agents.vehicle_agent import VehicleAgent, distance_batch
 from agents.intersection_agent import IntersectionAgent
 from agents.crisis_manager_agent import CrisisManagerAgent
 from algorithms.routing import RoadNetwork, AStarRouter, DynamicRouter
@@ -77,10 +77,24 @@ class TrafficModel(Model):
         # Ordonnanceur d'agents (activation aléatoire)
         self.schedule = RandomActivation(self)
         
+        # OPTIMISATION: index unique_id -> agent pour get_agent_by_id en O(1)
+        self._by_id: Dict[str, object] = {}
+        
         # OPTIMISATION: Listes séparées pour accès rapide sans isinstance
         self.vehicle_agents: List[VehicleAgent] = []
         self.intersection_agents: List[IntersectionAgent] = []
         
+        # OPTIMISATION: positions/destinations/waypoints en SoA (N, 2) ; la ligne
+        # vehicle._slot (= indice dans self.vehicles) est tenue à jour en place par le véhicule
+        self.vehicle_pos = np.zeros((0, 2), dtype=np.float64)
+        self.vehicle_dest = np.zeros((0, 2), dtype=np.float64)
+        self.vehicle_target = np.zeros((0, 2), dtype=np.float64)
+        # False dès que le véhicule a bougé depuis le dernier calcul en lot
+        self.vehicle_fresh = np.zeros(0, dtype=bool)
+        # Distances restantes et directions calculées en lot à chaque step
+        self.vehicle_remaining = np.zeros(0, dtype=np.float64)
+        self.vehicle_direction = np.zeros((0, 2), dtype=np.float64)
+        
         # Réseau routier (maillage plus large pour des performances raisonnables)
         self.road_network = RoadNetwork()
         road_cell_size = max(self.cell_size, 100)  # Minimum 100m entre nœuds du réseau
@@ -137,6 +151,7 @@ class TrafficModel(Model):
         )
         self.crisis_manager.position = (self.width // 2, self.height // 2)
         self.schedule.add(self.crisis_manager)
+        self._by_id[self.crisis_manager.unique_id] = self.crisis_manager
         
         # Initialiser les scénarios selon le scénario actif
         self.rush_hour_info = None
@@ -208,6 +223,7 @@ class TrafficModel(Model):
                 self.intersections.append(intersection)
                 self.intersection_agents.append(intersection)  # OPTIMISATION: Liste séparée
                 self.schedule.add(intersection)
+                self._by_id[intersection.unique_id] = intersection
                 intersection_id += 1
         
         # Connecter les intersections voisines
@@ -321,9 +337,11 @@ class TrafficModel(Model):
         if route:
             vehicle.current_route = route
         
+        self._assign_vehicle_slot(vehicle)
         self.vehicles.append(vehicle)
         self.vehicle_agents.append(vehicle)  # OPTIMISATION: Liste séparée
         self.schedule.add(vehicle)
+        self._by_id[vehicle.unique_id] = vehicle
         self.total_vehicles_created += 1
         
         # Ajouter le véhicule à SUMO si activé
@@ -352,13 +370,6 @@ class TrafficModel(Model):
         """Calcule une route entre deux points"""
         return self.router.find_path(start, end, consider_traffic=True)
     
-    def get_agent_by_id(self, agent_id: str):
-        """Récupère un agent par son ID"""
-        for agent in self.schedule.agents:
-            if agent.unique_id == agent_id:
-                return agent
-        return None
-    
     def step(self):
         """
         Effectue un pas de simulation
@@ -371,6 +382,9 @@ class TrafficModel(Model):
         # Router les messages en attente
         self._route_pending_messages()
         
+        # Distances restantes de tous les véhicules en un seul calcul
+        self._update_vehicle_arrays()
+        
         # Activer tous les agents
         self.schedule.step()
         
@@ -406,6 +420,53 @@ class TrafficModel(Model):
         # Incrémenter le compteur
         self.current_step += 1
     
+    def _assign_vehicle_slot(self, vehicle: VehicleAgent):
+        """Réserve la ligne suivante des tableaux SoA pour un nouveau véhicule"""
+        slot = len(self.vehicles)
+        
+        # Agrandir les tampons uniquement si nécessaire (capacité doublée, contenu conservé)
+        if self.vehicle_pos.shape[0] <= slot:
+            capacity = max(16, 2 * self.vehicle_pos.shape[0])
+            for name in ('vehicle_pos', 'vehicle_dest', 'vehicle_target', 'vehicle_fresh'):
+                old = getattr(self, name)
+                new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                new[:slot] = old[:slot]
+                setattr(self, name, new)
+        
+        vehicle._slot = slot
+        self.vehicle_dest[slot] = vehicle.destination
+        vehicle._sync_arrays()
+    
+    def _release_vehicle_slot(self, vehicle: VehicleAgent):
+        """Retire un véhicule de self.vehicles et des tableaux SoA (le dernier prend sa place)"""
+        slot = vehicle._slot
+        last = self.vehicles.pop()
+        last_slot = len(self.vehicles)
+        if last is not vehicle:
+            self.vehicles[slot] = last
+            last._slot = slot
+            self.vehicle_pos[slot] = self.vehicle_pos[last_slot]
+            self.vehicle_dest[slot] = self.vehicle_dest[last_slot]
+            self.vehicle_target[slot] = self.vehicle_target[last_slot]
+            # Les résultats du dernier calcul en lot sont indexés par l'ancienne ligne
+            self.vehicle_fresh[slot] = False
+        vehicle._slot = None
+    
+    def _update_vehicle_arrays(self):
+        """
+        Calcule en un seul appel NumPy chacune la distance restante et la direction
+        vers le prochain waypoint de tous les véhicules, à partir des tableaux SoA
+        vehicle_pos / vehicle_dest / vehicle_target tenus à jour par les véhicules.
+        """
+        n = len(self.vehicles)
+        if n == 0:
+            return
+        
+        pos = self.vehicle_pos[:n]
+        self.vehicle_remaining = distance_batch(pos, self.vehicle_dest[:n])
+        self.vehicle_direction = VehicleAgent._directions_batch(pos, self.vehicle_target[:n])
+        self.vehicle_fresh[:n] = True
+    
     def _route_pending_messages(self):
         """Route tous les messages en attente"""
         for agent in self.schedule.agents:
@@ -424,9 +485,10 @@ class TrafficModel(Model):
         
         # Retirer les véhicules arrivés
         for vehicle in arrived:
-            self.vehicles.remove(vehicle)
+            self._release_vehicle_slot(vehicle)
             self.vehicle_agents.remove(vehicle)  # OPTIMISATION: Retirer aussi de la liste séparée
             self.schedule.remove(vehicle)
+            self._by_id.pop(vehicle.unique_id, None)
     
     def _run_scenarios(self):
         """Exécute les scénarios actifs à chaque pas de simulation"""
@@ -474,10 +536,7 @@ class TrafficModel(Model):
 
     def get_agent_by_id(self, agent_id: str):
         """Retourne un agent par son unique_id, ou None s'il n'existe pas"""
-        for agent in self.schedule.agents:
-            if agent.unique_id == agent_id:
-                return agent
-        return None
+        return self._by_id.get(agent_id)
 
     def get_statistics(self) -> Dict:
         """Retourne les statistiques complètes de la simulation"""
@@ -567,8 +626,10 @@ class TrafficModel(Model):
                     logger.info(f"  ✅ {len(vehicles_data)} véhicules sauvegardés")
                 
                 # Sauvegarder toutes les intersections
-                for intersection in self.intersections:
-                    self.db.insert_intersection(self.simulation_id, intersection.get_statistics())
+                self.db.insert_intersections_batch(
+                    self.simulation_id,
+                    [intersection.get_statistics() for intersection in self.intersections]
+                )
                 
                 logger.info(f"  ✅ {len(self.intersections)} intersections sauvegardées")
                 
@@ -583,6 +644,10 @@ class TrafficModel(Model):
                 
             except Exception as e:
                 logger.error(f"❌ Erreur lors de la sauvegarde finale: {e}")
+            finally:
+                # Arrêter le thread d'écriture et libérer le pool de connexions
+                self.db.close()
+                self.db = None
         
         # Fermer SUMO si connecté
         if self.use_sumo and self.sumo_connector:
@@ -4,10 +4,51 @@ Simulation d'une panne de véhicule sur le Pont De Gaulle
 et observation de la capacité du système à rediriger les flux vers le Pont HKB
 """
 import random
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
+import numpy as np
 from loguru import logger
 
 
+class ScenarioCfg(NamedTuple):
+    """Configuration figée du scénario d'incident"""
+    name: str
+    description: str
+    start: float
+    duration: float
+    end: float
+    blocked_name: str
+    alternative_name: str
+    blocked_coords: np.ndarray      # (2, 2) : extrémités de la route bloquée
+    alternative_coords: np.ndarray  # (2, 2) : extrémités de la route alternative
+    incident_center: Tuple[float, float]
+    
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ScenarioCfg':
+        """Lit la section scenarios.incident_bridge de config.yaml"""
+        start = config.get('start_time', 1800)
+        duration = config.get('duration', 900)
+        blocked_road = config.get('blocked_road', {})
+        alternative_road = config.get('alternative_road', {})
+        blocked_coords = np.asarray(
+            blocked_road.get('coordinates', [[2500, 2000], [2500, 2500]]), dtype=np.float64)
+        alternative_coords = np.asarray(
+            alternative_road.get('coordinates', [[3000, 2000], [3000, 2500]]), dtype=np.float64)
+        
+        return cls(
+            name=config.get('name', 'Incident Pont De Gaulle'),
+            description=config.get('description',
+                'Panne véhicule sur Pont De Gaulle -> redirection Pont HKB'),
+            start=start,
+            duration=duration,
+            end=start + duration,
+            blocked_name=blocked_road.get('name', 'Pont De Gaulle'),
+            alternative_name=alternative_road.get('name', 'Pont HKB'),
+            blocked_coords=blocked_coords,
+            alternative_coords=alternative_coords,
+            incident_center=tuple(blocked_coords.mean(axis=0).tolist()),
+        )
+
+
 class IncidentScenario:
     """
     Gère le scénario d'incident sur le Pont De Gaulle.
@@ -31,25 +72,8 @@ class IncidentScenario:
         if config is None:
             config = model.config.get('scenarios', {}).get('incident_bridge', {})
         
-        self.name = config.get('name', 'Incident Pont De Gaulle')
-        self.description = config.get('description', 
-            'Panne véhicule sur Pont De Gaulle -> redirection Pont HKB')
-        
-        # Timing de l'incident
-        self.incident_start_time = config.get('start_time', 1800)
-        self.incident_duration = config.get('duration', 900)
-        self.incident_end_time = self.incident_start_time + self.incident_duration
-        
-        # Routes concernées
-        blocked_road = config.get('blocked_road', {})
-        self.blocked_road_name = blocked_road.get('name', 'Pont De Gaulle')
-        self.blocked_road_coords = blocked_road.get('coordinates', 
-            [[2500, 2000], [2500, 2500]])
-        
-        alternative_road = config.get('alternative_road', {})
-        self.alternative_road_name = alternative_road.get('name', 'Pont HKB')
-        self.alternative_road_coords = alternative_road.get('coordinates',
-            [[3000, 2000], [3000, 2500]])
+        # Configuration figée une fois pour toutes (aucune lecture de dict pendant les steps)
+        self._cfg = ScenarioCfg.from_config(config)
         
         # État de l'incident
         self.incident_active = False
@@ -66,6 +90,44 @@ class IncidentScenario:
             'congestion_messages_sent': 0
         }
     
+    # ============ CONFIGURATION (lecture seule) ============
+    
+    @property
+    def name(self) -> str:
+        return self._cfg.name
+    
+    @property
+    def description(self) -> str:
+        return self._cfg.description
+    
+    @property
+    def incident_start_time(self) -> float:
+        return self._cfg.start
+    
+    @property
+    def incident_duration(self) -> float:
+        return self._cfg.duration
+    
+    @property
+    def incident_end_time(self) -> float:
+        return self._cfg.end
+    
+    @property
+    def blocked_road_name(self) -> str:
+        return self._cfg.blocked_name
+    
+    @property
+    def blocked_road_coords(self) -> np.ndarray:
+        return self._cfg.blocked_coords
+    
+    @property
+    def alternative_road_name(self) -> str:
+        return self._cfg.alternative_name
+    
+    @property
+    def alternative_road_coords(self) -> np.ndarray:
+        return self._cfg.alternative_coords
+    
     def setup(self):
         """Configure le scénario (appelé au début de la simulation)"""
         logger.info(f"📋 Scénario '{self.name}' configuré")
@@ -187,7 +249,7 @@ class IncidentScenario:
                     content={
                         "type": "incident_report",
                         "incident_type": "vehicle_breakdown",
-                        "location": self.blocked_road_coords[0],
+                        "location": self.blocked_road_coords[0].tolist(),
                         "severity": "high",
                         "road_name": self.blocked_road_name,
                         "alternative_road": self.alternative_road_name
@@ -202,10 +264,7 @@ class IncidentScenario:
         from communication.fipa_message import FIPAMessage
         from agents.intersection_agent import IntersectionAgent
         
-        incident_center = (
-            (self.blocked_road_coords[0][0] + self.blocked_road_coords[1][0]) / 2,
-            (self.blocked_road_coords[0][1] + self.blocked_road_coords[1][1]) / 2
-        )
+        incident_center = self._cfg.incident_center
         
         broadcast_radius = 1000.0  # 1km autour de l'incident
         
@@ -271,10 +330,7 @@ class IncidentScenario:
         from communication.fipa_message import FIPAMessage
         from agents.intersection_agent import IntersectionAgent
 
-        incident_center = (
-            (self.blocked_road_coords[0][0] + self.blocked_road_coords[1][0]) / 2,
-            (self.blocked_road_coords[0][1] + self.blocked_road_coords[1][1]) / 2
-        )
+        incident_center = self._cfg.incident_center
         broadcast_radius = 1000.0
 
         for agent in self.model.schedule.agents:
@@ -16,6 +16,48 @@ except ImportError:
     BBOX_PLATEAU = None
 
 
+class _AliasTable:
+    """
+    Table d'alias de Vose : tirage pondéré en O(1) après une construction en O(n).
+    Utilise le module random (donc la graine de la simulation).
+    """
+    
+    __slots__ = ('prob', 'alias', 'n')
+    
+    def __init__(self, weights: List[float]):
+        self.n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * self.n / total for w in weights]
+        self.prob = [1.0] * self.n
+        self.alias = list(range(self.n))
+        
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Les restes valent 1 (aux erreurs d'arrondi près)
+    
+    def sample(self) -> int:
+        """Tire un indice selon les poids"""
+        i = random.randrange(self.n)
+        return i if random.random() < self.prob[i] else self.alias[i]
+
+
+def _select_zone(scenario_info: Dict, zones_key: str) -> Dict:
+    """Tire une zone pondérée ; la table d'alias est construite une fois par scénario"""
+    zones = scenario_info[zones_key]
+    cache_key = f'_{zones_key}_alias'
+    alias = scenario_info.get(cache_key)
+    if alias is None or alias.n != len(zones):
+        alias = _AliasTable([z['weight'] for z in zones])
+        scenario_info[cache_key] = alias
+    return zones[alias.sample()]
+
+
 def setup_scenario(model, config: Dict = None) -> Dict:
     """
     Configure le scénario d'heure de pointe matinale.
@@ -106,10 +148,7 @@ def get_origin_position(scenario_info: Dict) -> Tuple[float, float]:
     Returns:
         (lon, lat) si use_real_coords=True, sinon (x, y) en mètres
     """
-    origins = scenario_info['origin_zones']
-    weights = [z['weight'] for z in origins]
-    
-    selected_zone = random.choices(origins, weights=weights)[0]
+    selected_zone = _select_zone(scenario_info, 'origin_zones')
     
     # Si on utilise les vraies coordonnées GPS (réseau OSM)
     if scenario_info.get('use_real_coords', False) and 'bbox' in selected_zone:
@@ -136,10 +175,7 @@ def get_destination_position(scenario_info: Dict) -> Tuple[float, float]:
     Returns:
         (lon, lat) si use_real_coords=True, sinon (x, y) en mètres
     """
-    destinations = scenario_info['destination_zones']
-    weights = [z['weight'] for z in destinations]
-    
-    selected_zone = random.choices(destinations, weights=weights)[0]
+    selected_zone = _select_zone(scenario_info, 'destination_zones')
     
     # Si on utilise les vraies coordonnées GPS (réseau OSM)
     if scenario_info.get('use_real_coords', False) and 'bbox' in selected_zone:
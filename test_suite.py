@@ -4,12 +4,26 @@ avant de lancer la simulation complète.
 
 Usage:
     python test_suite.py
+    python test_suite.py --only files,db
+    python test_suite.py --skip imports,sumo
 """
+import argparse
+import ast
+import functools
+import importlib.machinery
+import importlib.util
 import os
 import sys
 import yaml
+from contextlib import closing
 from pathlib import Path
 
+# Chargeur YAML natif (libyaml) si disponible, sinon repli pur Python
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Couleurs pour l'affichage
 class Colors:
     GREEN = '\033[92m'
@@ -18,10 +32,92 @@ class Colors:
     BLUE = '\033[94m'
     RESET = '\033[0m'
 
+# Pas de codes ANSI quand la sortie est redirigée (CI, capture pytest)
+if not sys.stdout.isatty():
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.RESET = ''
+
+PASS = f"{Colors.GREEN}✓ PASS{Colors.RESET}"
+FAIL = f"{Colors.RED}✗ FAIL{Colors.RESET}"
+SKIP = f"{Colors.YELLOW}- SKIP{Colors.RESET}"
+
+# Invariants de config.yaml (sections, Pont De Gaulle en x=2000, champs PostgreSQL)
+CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ['simulation', 'environment', 'intersection', 'vehicle',
+                 'communication', 'algorithms', 'scenarios', 'database'],
+    "properties": {
+        "scenarios": {
+            "type": "object",
+            "properties": {
+                "incident_bridge": {
+                    "type": "object",
+                    "required": ["blocked_road"],
+                    "properties": {
+                        "blocked_road": {
+                            "type": "object",
+                            "required": ["coordinates"],
+                            # [[2000, y1], [2000, y2]] pour le Pont De Gaulle (col=2)
+                            "properties": {
+                                "coordinates": {
+                                    "type": "array",
+                                    "minItems": 2,
+                                    "maxItems": 2,
+                                    "items": {
+                                        "type": "array",
+                                        "minItems": 2,
+                                        "items": [{"const": 2000}, {"type": "number"}],
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+        "database": {
+            "type": "object",
+            "properties": {
+                "postgresql": {
+                    "type": "object",
+                    "required": ['host', 'port', 'database', 'user', 'password'],
+                },
+            },
+        },
+    },
+}
+
+# Le validateur est compilé une fois à l'import
+try:
+    import jsonschema
+    _CONFIG_VALIDATOR = jsonschema.Draft7Validator(CONFIG_SCHEMA)
+except ImportError:
+    _CONFIG_VALIDATOR = None
+
+@functools.cache
+def _load_config():
+    """Charge config.yaml une seule fois pour toute la suite"""
+    with open("config.yaml", 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+_SCANNED_DIRS = (".", "agents", "communication", "algorithms", "environment",
+                 "scenarios", "sumo_integration", "visualizations", "utils")
+
+@functools.cache
+def _existing_paths(roots=_SCANNED_DIRS):
+    """Liste en une passe (os.scandir) les fichiers présents dans les dossiers du projet"""
+    paths = set()
+    for root in roots:
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    paths.add(entry.name if root == "." else f"{root}/{entry.name}")
+        except OSError:
+            continue
+    return frozenset(paths)
+
 def print_test(name, passed, details=""):
     """Affiche le résultat d'un test"""
-    status = f"{Colors.GREEN}✓ PASS{Colors.RESET}" if passed else f"{Colors.RED}✗ FAIL{Colors.RESET}"
-    print(f"  {status} {name}")
+    print(f"  {PASS if passed else FAIL} {name}")
     if details and not passed:
         print(f"      → {Colors.YELLOW}{details}{Colors.RESET}")
 
@@ -49,61 +145,71 @@ def test_file_structure():
         "utils/database.py",
     ]
     
-    all_exist = True
-    for file in required_files:
-        exists = os.path.exists(file)
+    existing = _existing_paths()
+    results = [(file, file in existing) for file in required_files]
+    for file, exists in results:
         print_test(file, exists, "Fichier manquant" if not exists else "")
-        all_exist = all_exist and exists
     
-    return all_exist
+    return all(ok for _, ok in results)
+
+def _check_config_manually(config):
+    """Vérifications manuelles des invariants de config.yaml (repli sans jsonschema)"""
+    # Vérifier les sections principales
+    # (nom, succès, détail en cas d'échec)
+    results = [(f"Section '{section}'", section in config, "Section manquante")
+               for section in CONFIG_SCHEMA["required"]]
+    
+    # Vérifier les coordonnées du Pont De Gaulle
+    if 'scenarios' in config and 'incident_bridge' in config['scenarios']:
+        incident = config['scenarios']['incident_bridge']
+        coords = incident.get('blocked_road', {}).get('coordinates', [])
+        
+        # Les coordonnées doivent être [[2000, y1], [2000, y2]] pour le Pont De Gaulle (col=2)
+        if coords and len(coords) == 2:
+            x1, x2 = coords[0][0], coords[1][0]
+            results.append((
+                "Coordonnées Pont De Gaulle (x=2000)", 
+                x1 == 2000 and x2 == 2000,
+                f"Coordonnées incorrectes: {coords}. Attendu: x=2000"
+            ))
+        else:
+            results.append(("Coordonnées Pont De Gaulle", False, "Format invalide"))
+    
+    # Vérifier la base de données
+    if 'database' in config and 'postgresql' in config['database']:
+        db = config['database']['postgresql']
+        required_db_fields = ['host', 'port', 'database', 'user', 'password']
+        results.extend((f"DB config '{field}'", field in db, "Champ manquant")
+                       for field in required_db_fields)
+    
+    return results
 
 def test_config_yaml():
     """Vérifie la cohérence du fichier config.yaml"""
     print(f"\n{Colors.BLUE}[2] Configuration (config.yaml){Colors.RESET}")
     
     try:
-        with open("config.yaml", 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _load_config()
         
-        # Vérifier les sections principales
-        sections = ['simulation', 'environment', 'intersection', 'vehicle', 
-                   'communication', 'algorithms', 'scenarios', 'database']
-        all_ok = True
+        # Sans jsonschema : vérifications manuelles, la validation du schéma est ignorée
+        if _CONFIG_VALIDATOR is None:
+            print(f"  {SKIP} Validation du schéma")
+            print(f"      → {Colors.YELLOW}Installer avec: pip install jsonschema{Colors.RESET}")
+            results = _check_config_manually(config)
+            for name, ok, details in results:
+                print_test(name, ok, details)
+            return all(ok for _, ok, _ in results)
         
-        for section in sections:
-            exists = section in config
-            print_test(f"Section '{section}'", exists, f"Section manquante")
-            all_ok = all_ok and exists
+        # Une seule passe de validation, une ligne par invariant violé
+        errors = sorted(_CONFIG_VALIDATOR.iter_errors(config), key=lambda e: list(e.absolute_path))
+        for error in errors:
+            path = "/".join(str(p) for p in error.absolute_path) or "config.yaml"
+            print_test(path, False, error.message)
         
-        # Vérifier les coordonnées du Pont De Gaulle
-        if 'scenarios' in config and 'incident_bridge' in config['scenarios']:
-            incident = config['scenarios']['incident_bridge']
-            coords = incident.get('blocked_road', {}).get('coordinates', [])
-            
-            # Les coordonnées doivent être [[2000, y1], [2000, y2]] pour le Pont De Gaulle (col=2)
-            if coords and len(coords) == 2:
-                x1, x2 = coords[0][0], coords[1][0]
-                correct = (x1 == 2000 and x2 == 2000)
-                print_test(
-                    "Coordonnées Pont De Gaulle (x=2000)", 
-                    correct,
-                    f"Coordonnées incorrectes: {coords}. Attendu: x=2000"
-                )
-                all_ok = all_ok and correct
-            else:
-                print_test("Coordonnées Pont De Gaulle", False, "Format invalide")
-                all_ok = False
+        if not errors:
+            print_test("Schéma config.yaml", True)
         
-        # Vérifier la base de données
-        if 'database' in config and 'postgresql' in config['database']:
-            db = config['database']['postgresql']
-            required_db_fields = ['host', 'port', 'database', 'user', 'password']
-            for field in required_db_fields:
-                exists = field in db
-                print_test(f"DB config '{field}'", exists, f"Champ manquant")
-                all_ok = all_ok and exists
-        
-        return all_ok
+        return not errors
         
     except Exception as e:
         print_test("Lecture config.yaml", False, str(e))
@@ -123,25 +229,18 @@ def test_imports():
         ("loguru", "Loguru"),
     ]
     
-    all_ok = True
-    for module_name, description in modules:
-        try:
-            __import__(module_name)
-            print_test(description, True)
-        except ImportError:
-            print_test(description, False, f"Installer avec: pip install {module_name}")
-            all_ok = False
+    # find_spec vérifie la présence du paquet sans exécuter son initialisation
+    results = [(module_name, description, importlib.util.find_spec(module_name) is not None)
+               for module_name, description in modules]
+    for module_name, description, ok in results:
+        print_test(description, ok, f"Installer avec: pip install {module_name}")
     
     # SUMO (optionnel mais recommandé)
-    try:
-        import traci
-        import sumolib
-        print_test("SUMO (traci/sumolib)", True)
-    except ImportError:
-        print_test("SUMO (traci/sumolib)", False, 
-                  "Optionnel. Installer avec: pip install eclipse-sumo traci sumolib")
+    sumo_ok = all(importlib.util.find_spec(m) is not None for m in ("traci", "sumolib"))
+    print_test("SUMO (traci/sumolib)", sumo_ok, 
+              "Optionnel. Installer avec: pip install eclipse-sumo traci sumolib")
     
-    return all_ok
+    return all(ok for _, _, ok in results)
 
 def test_sumo_network():
     """Vérifie que les fichiers SUMO sont générés"""
@@ -154,14 +253,13 @@ def test_sumo_network():
         "sumo_integration/vtypes.add.xml",
     ]
     
-    all_exist = True
-    for file in sumo_files:
-        exists = os.path.exists(file)
+    existing = _existing_paths()
+    results = [(file, file in existing) for file in sumo_files]
+    for file, exists in results:
         print_test(file, exists, 
                   "Générer avec: python sumo_integration/generate_network.py" if not exists else "")
-        all_exist = all_exist and exists
     
-    return all_exist
+    return all(ok for _, ok in results)
 
 def test_database_connection():
     """Teste la connexion à PostgreSQL"""
@@ -169,40 +267,38 @@ def test_database_connection():
     
     try:
         import psycopg2
-        with open("config.yaml", 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = _load_config()
         
         db_config = config['database']['postgresql']
         
-        # Tentative de connexion
+        # Tentative de connexion (délai borné si le serveur est injoignable)
         try:
-            conn = psycopg2.connect(
+            with closing(psycopg2.connect(
                 host=db_config['host'],
                 port=db_config['port'],
                 database=db_config['database'],
                 user=db_config['user'],
-                password=db_config['password']
-            )
-            print_test("Connexion PostgreSQL", True)
-            
-            # Vérifier que les tables existent
-            cursor = conn.cursor()
-            tables = ['simulations', 'vehicles', 'intersections', 'kpis_timeseries', 'fipa_messages']
-            all_tables_exist = True
-            
-            for table in tables:
+                password=db_config['password'],
+                connect_timeout=2
+            )) as conn, conn.cursor() as cursor:
+                print_test("Connexion PostgreSQL", True)
+                
+                # Vérifier que les tables existent
+                tables = ['simulations', 'vehicles', 'intersections', 'kpis_timeseries', 'fipa_messages']
+                
+                # Une seule requête pour toutes les tables (un aller-retour réseau)
                 cursor.execute(
-                    "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = %s)",
-                    (table,)
+                    "SELECT table_name FROM information_schema.tables WHERE table_name = ANY(%s)",
+                    (tables,)
                 )
-                exists = cursor.fetchone()[0]
+                present = {row[0] for row in cursor.fetchall()}
+            
+            for table in tables:
+                exists = table in present
                 print_test(f"Table '{table}'", exists, 
                           "Créer avec: python setup_database.py" if not exists else "")
-                all_tables_exist = all_tables_exist and exists
             
-            cursor.close()
-            conn.close()
-            return all_tables_exist
+            return all(table in present for table in tables)
             
         except psycopg2.OperationalError as e:
             print_test("Connexion PostgreSQL", False, str(e))
@@ -212,11 +308,19 @@ def test_database_connection():
         print_test("Test base de données", False, str(e))
         return False
 
+def _module_origin(module_path):
+    """Résout le fichier source d'un module sans exécuter le __init__ de son paquet"""
+    *package, name = module_path.split(".")
+    spec = importlib.machinery.PathFinder.find_spec(name, [os.path.join(".", *package)])
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError(f"Module '{module_path}' introuvable")
+    return spec.origin
+
 def test_code_consistency():
-    """Vérifie la cohérence du code (imports, syntaxe basique)"""
+    """Vérifie la cohérence du code (syntaxe, classes principales définies)"""
     print(f"\n{Colors.BLUE}[6] Cohérence du code{Colors.RESET}")
     
-    # Tester l'import des modules principaux
+    # Analyser (AST) les modules principaux sans les importer
     modules_to_test = [
         ("agents.bdi_agent", "BDIAgent"),
         ("agents.vehicle_agent", "VehicleAgent"),
@@ -227,32 +331,71 @@ def test_code_consistency():
         ("environment.traffic_model", "TrafficModel"),
     ]
     
-    all_ok = True
+    results = []
     for module_path, class_name in modules_to_test:
+        name = f"{module_path}.{class_name}"
         try:
-            module = __import__(module_path, fromlist=[class_name])
-            getattr(module, class_name)
-            print_test(f"{module_path}.{class_name}", True)
+            tree = ast.parse(Path(_module_origin(module_path)).read_bytes())
+            defined = any(isinstance(n, ast.ClassDef) and n.name == class_name
+                          for n in ast.walk(tree))
+            results.append((name, defined, f"Classe '{class_name}' introuvable"))
         except Exception as e:
-            print_test(f"{module_path}.{class_name}", False, str(e))
-            all_ok = False
+            results.append((name, False, str(e)))
+    
+    for name, ok, details in results:
+        print_test(name, ok, details)
     
-    return all_ok
+    return all(ok for _, ok, _ in results)
+
+# Clé CLI -> (libellé du résumé, fonction de test)
+TESTS = {
+    "files": ("Structure des fichiers", test_file_structure),
+    "config": ("Configuration YAML", test_config_yaml),
+    "imports": ("Imports Python", test_imports),
+    "sumo": ("Réseau SUMO", test_sumo_network),
+    "db": ("Base de données", test_database_connection),
+    "code": ("Cohérence du code", test_code_consistency),
+}
+
+def _parse_test_keys(value):
+    """Convertit 'files,db' en liste de clés de TESTS"""
+    keys = [k.strip() for k in value.split(",") if k.strip()]
+    unknown = [k for k in keys if k not in TESTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"Test(s) inconnu(s): {', '.join(unknown)}. Choix: {', '.join(TESTS)}"
+        )
+    return keys
 
-def main():
-    """Exécute tous les tests"""
+def main(argv=None):
+    """Exécute tous les tests (ou le sous-ensemble choisi via --only/--skip)"""
+    parser = argparse.ArgumentParser(description="Suite de tests du projet SMA Trafic")
+    parser.add_argument(
+        '--only',
+        type=_parse_test_keys,
+        default=None,
+        help=f"Tests à exécuter, séparés par des virgules ({', '.join(TESTS)})"
+    )
+    parser.add_argument(
+        '--skip',
+        type=_parse_test_keys,
+        default=[],
+        help="Tests à ignorer, séparés par des virgules"
+    )
+    args = parser.parse_args(argv)
+    
+    selected = [k for k in TESTS
+                if (args.only is None or k in args.only) and k not in args.skip]
+    
+    # Repartir d'un état frais si la suite est relancée dans le même processus
+    _existing_paths.cache_clear()
+    _load_config.cache_clear()
+    
     print(f"\n{'='*60}")
     print(f"{Colors.BLUE}🧪 SUITE DE TESTS - Système Multi-Agent de Trafic{Colors.RESET}")
     print(f"{'='*60}")
     
-    results = {
-        "Structure des fichiers": test_file_structure(),
-        "Configuration YAML": test_config_yaml(),
-        "Imports Python": test_imports(),
-        "Réseau SUMO": test_sumo_network(),
-        "Base de données": test_database_connection(),
-        "Cohérence du code": test_code_consistency(),
-    }
+    results = {TESTS[key][0]: TESTS[key][1]() for key in selected}
     
     # Résumé
     print(f"\n{'='*60}")
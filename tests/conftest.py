@@ -0,0 +1,26 @@
+"""
+Fixtures partagées pour les tests
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from environment.traffic_model import TrafficModel
+
+
+@pytest.fixture(scope="session")
+def config_path():
+    """Chemin de config.yaml, résolu une seule fois par session"""
+    path = Path(__file__).parent.parent / "config.yaml"
+    if not path.exists():
+        pytest.skip("Fichier config.yaml non trouvé")
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def traffic_model(config_path):
+    """Modèle complet construit une seule fois par session (réseau, intersections, véhicules)"""
+    return TrafficModel(config_path=config_path)
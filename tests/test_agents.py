@@ -1,8 +1,10 @@
 """
 Tests unitaires pour les agents du système
 """
+import contextlib
 import pytest
 import sys
+import time
 from pathlib import Path
 
 # Ajouter le répertoire parent au path
@@ -11,7 +13,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from agents.bdi_agent import BDIAgent, Belief, Desire, Intention, BeliefType, DesireType
 from agents.vehicle_agent import VehicleAgent
 from agents.intersection_agent import IntersectionAgent
-from environment.traffic_model import TrafficModel
 
 
 class MockModel:
@@ -22,32 +23,43 @@ class MockModel:
         self.schedule = MockSchedule()
 
     def get_agent_by_id(self, agent_id: str):
-        for agent in self.schedule.agents:
-            if agent.unique_id == agent_id:
-                return agent
-        return None
+        return self.schedule._by_id.get(agent_id)
 
 
 class MockSchedule:
-    """Ordonnanceur simulé"""
+    """Ordonnanceur simulé (agents indexés par unique_id, ordre d'insertion conservé)"""
     def __init__(self):
-        self.agents = []
+        self._by_id: dict = {}
+    
+    @property
+    def agents(self):
+        return list(self._by_id.values())
     
     def add(self, agent):
-        self.agents.append(agent)
+        self._by_id[agent.unique_id] = agent
     
     def remove(self, agent):
-        if agent in self.agents:
-            self.agents.remove(agent)
+        if self._by_id.get(agent.unique_id) is agent:
+            del self._by_id[agent.unique_id]
+
+
+@pytest.fixture
+def mock_model():
+    """Modèle simulé neuf pour chaque test"""
+    return MockModel()
+
+
+@pytest.fixture
+def fresh_intersection(mock_model):
+    """Intersection isolée au centre de la carte"""
+    return IntersectionAgent("intersection_1", mock_model, position=(500, 500))
 
 
 class TestBDIAgent:
     """Tests pour la classe de base BDIAgent"""
     
-    def test_belief_creation(self):
+    def test_belief_creation(self, mock_model):
         """Test la création de croyances"""
-        model = MockModel()
-        
         class TestAgent(BDIAgent):
             def perceive(self): pass
             def generate_desires(self): pass
@@ -55,7 +67,7 @@ class TestBDIAgent:
             def execute_intention(self, intention): return True
             def handle_message(self, message): pass
         
-        agent = TestAgent("test_agent", model)
+        agent = TestAgent("test_agent", mock_model)
         
         # Ajouter une croyance
         agent.update_belief(BeliefType.POSITION, (100, 200))
@@ -78,10 +90,8 @@ class TestBDIAgent:
         # Invalide au temps 15
         assert belief.is_valid(15.0, validity_duration=10.0) == False
     
-    def test_desire_priority(self):
+    def test_desire_priority(self, mock_model):
         """Test la priorisation des désirs"""
-        model = MockModel()
-        
         class TestAgent(BDIAgent):
             def perceive(self): pass
             def generate_desires(self): pass
@@ -89,7 +99,7 @@ class TestBDIAgent:
             def execute_intention(self, intention): return True
             def handle_message(self, message): pass
         
-        agent = TestAgent("test_agent", model)
+        agent = TestAgent("test_agent", mock_model)
         
         # Ajouter des désirs avec différentes priorités
         desire1 = Desire(type=DesireType.REACH_DESTINATION, priority=0.5)
@@ -112,13 +122,11 @@ class TestBDIAgent:
 class TestVehicleAgent:
     """Tests pour VehicleAgent"""
     
-    def test_vehicle_creation(self):
+    def test_vehicle_creation(self, mock_model):
         """Test la création d'un véhicule"""
-        model = MockModel()
-        
         vehicle = VehicleAgent(
             unique_id="vehicle_1",
-            model=model,
+            model=mock_model,
             position=(0, 0),
             destination=(100, 100),
             max_speed=13.89
@@ -130,13 +138,11 @@ class TestVehicleAgent:
         assert vehicle.speed == 0.0
         assert vehicle.max_speed == 13.89
     
-    def test_vehicle_distance_calculation(self):
+    def test_vehicle_distance_calculation(self, mock_model):
         """Test le calcul de distance"""
-        model = MockModel()
-        
         vehicle = VehicleAgent(
             unique_id="vehicle_1",
-            model=model,
+            model=mock_model,
             position=(0, 0),
             destination=(3, 4)
         )
@@ -145,13 +151,11 @@ class TestVehicleAgent:
         distance = vehicle._calculate_distance((0, 0), (3, 4))
         assert distance == 5.0
     
-    def test_vehicle_arrival(self):
+    def test_vehicle_arrival(self, mock_model):
         """Test la détection d'arrivée"""
-        model = MockModel()
-        
         vehicle = VehicleAgent(
             unique_id="vehicle_1",
-            model=model,
+            model=mock_model,
             position=(100, 100),
             destination=(105, 105)  # Très proche
         )
@@ -159,13 +163,11 @@ class TestVehicleAgent:
         # Devrait être considéré comme arrivé
         assert vehicle._is_at_destination() == True
     
-    def test_vehicle_direction(self):
+    def test_vehicle_direction(self, mock_model):
         """Test le calcul de direction"""
-        model = MockModel()
-        
         vehicle = VehicleAgent(
             unique_id="vehicle_1",
-            model=model,
+            model=mock_model,
             position=(0, 0),
             destination=(10, 0)
         )
@@ -180,40 +182,24 @@ class TestVehicleAgent:
 class TestIntersectionAgent:
     """Tests pour IntersectionAgent"""
     
-    def test_intersection_creation(self):
+    def test_intersection_creation(self, fresh_intersection):
         """Test la création d'une intersection"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
-        assert intersection.unique_id == "intersection_1"
-        assert intersection.position == (500, 500)
-        assert len(intersection.traffic_lights) > 0
+        assert fresh_intersection.unique_id == "intersection_1"
+        assert fresh_intersection.position == (500, 500)
+        assert len(fresh_intersection.traffic_lights) > 0
     
-    def test_traffic_light_initialization(self):
+    def test_traffic_light_initialization(self, fresh_intersection):
         """Test l'initialisation des feux"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
         from agents.intersection_agent import TrafficLightState, Direction
         
         # Vérifier que les feux sont initialisés
-        assert Direction.NORTH in intersection.traffic_lights
+        assert Direction.NORTH in fresh_intersection.traffic_lights
         
         # Vérifier l'alternance N-S / E-W
-        ns_states = [intersection.traffic_lights[Direction.NORTH],
-                    intersection.traffic_lights[Direction.SOUTH]]
-        ew_states = [intersection.traffic_lights[Direction.EAST],
-                    intersection.traffic_lights[Direction.WEST]]
+        ns_states = [fresh_intersection.traffic_lights[Direction.NORTH],
+                    fresh_intersection.traffic_lights[Direction.SOUTH]]
+        ew_states = [fresh_intersection.traffic_lights[Direction.EAST],
+                    fresh_intersection.traffic_lights[Direction.WEST]]
         
         # N-S devrait être vert initialement
         assert TrafficLightState.GREEN in ns_states
@@ -221,24 +207,16 @@ class TestIntersectionAgent:
         # E-W devrait être rouge initialement
         assert TrafficLightState.RED in ew_states
     
-    def test_state_representation(self):
+    def test_state_representation(self, fresh_intersection):
         """Test la représentation d'état pour Q-Learning"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
         # Ajouter des véhicules fictifs aux files
         from agents.intersection_agent import Direction
-        intersection.queue_lengths[Direction.NORTH] = 5
-        intersection.queue_lengths[Direction.SOUTH] = 3
-        intersection.queue_lengths[Direction.EAST] = 2
-        intersection.queue_lengths[Direction.WEST] = 1
+        fresh_intersection.queue_lengths[Direction.NORTH] = 5
+        fresh_intersection.queue_lengths[Direction.SOUTH] = 3
+        fresh_intersection.queue_lengths[Direction.EAST] = 2
+        fresh_intersection.queue_lengths[Direction.WEST] = 1
         
-        state = intersection._get_state_representation()
+        state = fresh_intersection._get_state_representation()
         
         # Devrait retourner une chaîne
         assert isinstance(state, str)
@@ -248,36 +226,22 @@ class TestIntersectionAgent:
 class TestTrafficModel:
     """Tests pour le modèle principal"""
     
-    def test_model_creation(self):
+    def test_model_creation(self, traffic_model):
         """Test la création du modèle"""
-        config_path = str(Path(__file__).parent.parent / "config.yaml")
-        try:
-            model = TrafficModel(config_path=config_path)
-            
-            assert model.width > 0
-            assert model.height > 0
-            assert len(model.intersections) > 0
-            assert len(model.vehicles) > 0
-            
-        except FileNotFoundError:
-            pytest.skip("Fichier config.yaml non trouvé")
+        assert traffic_model.width > 0
+        assert traffic_model.height > 0
+        assert len(traffic_model.intersections) > 0
+        assert len(traffic_model.vehicles) > 0
     
-    def test_model_step(self):
+    def test_model_step(self, traffic_model):
         """Test un pas de simulation"""
-        config_path = str(Path(__file__).parent.parent / "config.yaml")
-        try:
-            model = TrafficModel(config_path=config_path)
-            
-            initial_step = model.current_step
-            
-            # Faire un pas
-            model.step()
-            
-            # Vérifier que le compteur a augmenté
-            assert model.current_step == initial_step + 1
-            
-        except FileNotFoundError:
-            pytest.skip("Fichier config.yaml non trouvé")
+        initial_step = traffic_model.current_step
+        
+        # Faire un pas (le modèle est partagé : on ne vérifie que l'incrément)
+        traffic_model.step()
+        
+        # Vérifier que le compteur a augmenté
+        assert traffic_model.current_step == initial_step + 1
 
 
 class TestCommunication:
@@ -362,19 +326,70 @@ class TestRouting:
         assert abs(path[0][0] - 0) < 100
         assert abs(path[0][1] - 0) < 100
 
+    @staticmethod
+    def _path_cost(network, path):
+        """Coût d'un chemin, en vérifiant que chaque arête existe"""
+        return sum(network.nodes[a].neighbors[b] for a, b in zip(path, path[1:]))
+    
+    def test_astar_csr_matches_astar(self):
+        """Test que l'A* CSR trouve des chemins de même coût que l'A* Python"""
+        import random
+        from algorithms.routing import RoadNetwork, AStarRouter
+        
+        rng = random.Random(42)
+        network = RoadNetwork()
+        network.create_grid_network(width=1000, height=1000, cell_size=100)
+        for node1_id, node2_id in rng.sample(list(network.graph.edges()), 40):
+            network.remove_edge(node1_id, node2_id)
+        
+        router = AStarRouter(network)
+        node_ids = list(network.nodes)
+        for _ in range(50):
+            start_id, end_id = rng.sample(node_ids, 2)
+            expected = router._a_star(start_id, end_id)
+            path = router._a_star_csr(start_id, end_id)
+            
+            if expected is None:
+                assert path is None
+                continue
+            assert path[0] == start_id and path[-1] == end_id
+            assert self._path_cost(network, path) == pytest.approx(
+                self._path_cost(network, expected))
+    
+    def test_csr_invalidated_on_edge_change(self):
+        """Test que la représentation CSR est reconstruite après add_edge / remove_edge"""
+        from algorithms.routing import RoadNetwork, AStarRouter
+        
+        network = RoadNetwork()
+        network.create_grid_network(width=300, height=200, cell_size=100)
+        router = AStarRouter(network)
+        
+        assert router._a_star_csr("0_0", "200_0") == ["0_0", "100_0", "200_0"]
+        
+        # Couper la route directe : le chemin contourne par y=100
+        network.remove_edge("100_0", "200_0")
+        assert network._csr is None
+        path = router._a_star_csr("0_0", "200_0")
+        assert ("100_0", "200_0") not in zip(path, path[1:])
+        assert self._path_cost(network, path) == pytest.approx(400.0)
+        
+        # Rétablir la route : le chemin direct redevient le plus court
+        network.to_csr()
+        network.add_edge("100_0", "200_0")
+        assert network._csr is None
+        assert router._a_star_csr("0_0", "200_0") == ["0_0", "100_0", "200_0"]
+
 
 class TestCrisisManagerAgent:
     """Tests pour l'Agent Gestionnaire de Crise"""
     
-    def test_crisis_manager_creation(self):
+    def test_crisis_manager_creation(self, mock_model):
         """Test la création du gestionnaire de crise"""
         from agents.crisis_manager_agent import CrisisManagerAgent
         
-        model = MockModel()
-        
         crisis_manager = CrisisManagerAgent(
             unique_id="crisis_manager",
-            model=model
+            model=mock_model
         )
         
         assert crisis_manager.unique_id == "crisis_manager"
@@ -382,12 +397,11 @@ class TestCrisisManagerAgent:
         assert crisis_manager.green_waves_created == 0
         assert crisis_manager.active_incidents == []
     
-    def test_emergency_vehicle_registration(self):
+    def test_emergency_vehicle_registration(self, mock_model):
         """Test l'enregistrement d'un véhicule d'urgence"""
         from agents.crisis_manager_agent import CrisisManagerAgent
         
-        model = MockModel()
-        crisis_manager = CrisisManagerAgent("crisis_manager", model)
+        crisis_manager = CrisisManagerAgent("crisis_manager", mock_model)
         
         crisis_manager.register_emergency_vehicle(
             vehicle_id="ambulance_1",
@@ -400,13 +414,12 @@ class TestCrisisManagerAgent:
         assert len(crisis_manager.emergency_vehicles) == 1
         assert crisis_manager.emergency_vehicles[0]['type'] == "ambulance"
     
-    def test_crisis_manager_desire_generation(self):
+    def test_crisis_manager_desire_generation(self, mock_model):
         """Test la génération de désirs avec véhicules d'urgence"""
         from agents.crisis_manager_agent import CrisisManagerAgent
         from agents.bdi_agent import DesireType
         
-        model = MockModel()
-        crisis_manager = CrisisManagerAgent("crisis_manager", model)
+        crisis_manager = CrisisManagerAgent("crisis_manager", mock_model)
         
         # Enregistrer un véhicule d'urgence
         crisis_manager.register_emergency_vehicle(
@@ -423,12 +436,11 @@ class TestCrisisManagerAgent:
         desire_types = [d.type for d in crisis_manager.desires]
         assert DesireType.PRIORITIZE_EMERGENCY in desire_types
     
-    def test_crisis_manager_statistics(self):
+    def test_crisis_manager_statistics(self, mock_model):
         """Test les statistiques du gestionnaire de crise"""
         from agents.crisis_manager_agent import CrisisManagerAgent
         
-        model = MockModel()
-        crisis_manager = CrisisManagerAgent("crisis_manager", model)
+        crisis_manager = CrisisManagerAgent("crisis_manager", mock_model)
         
         stats = crisis_manager.get_statistics()
         assert stats['id'] == "crisis_manager"
@@ -439,65 +451,41 @@ class TestCrisisManagerAgent:
 class TestQLearning:
     """Tests pour l'implémentation Q-Learning"""
     
-    def test_q_table_initialization(self):
+    def test_q_table_initialization(self, fresh_intersection):
         """Test l'initialisation de la Q-table"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
         # La Q-table doit être vide au départ
-        assert intersection.q_table == {}
+        assert fresh_intersection.q_table == {}
     
-    def test_q_table_update(self):
+    def test_q_table_update(self, fresh_intersection):
         """Test la mise à jour de la Q-table (équation de Bellman)"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
         # Initialiser un état
         state = "2_1_NS"
         next_state = "1_2_EW"
-        intersection.q_table[state] = {'change': 0.0, 'keep': 0.0}
-        intersection.q_table[next_state] = {'change': 0.0, 'keep': 0.0}
+        fresh_intersection.q_table[state] = {'change': 0.0, 'keep': 0.0}
+        fresh_intersection.q_table[next_state] = {'change': 0.0, 'keep': 0.0}
         
         # Mettre à jour avec une récompense positive
-        intersection._update_q_table(state, 'change', reward=5.0, next_state=next_state)
+        fresh_intersection._update_q_table(state, 'change', reward=5.0, next_state=next_state)
         
         # La valeur Q doit avoir augmenté
-        assert intersection.q_table[state]['change'] > 0.0
+        assert fresh_intersection.q_table[state]['change'] > 0.0
         # keep doit rester à 0
-        assert intersection.q_table[state]['keep'] == 0.0
+        assert fresh_intersection.q_table[state]['keep'] == 0.0
     
-    def test_reward_computation(self):
+    def test_reward_computation(self, fresh_intersection):
         """Test le calcul de la récompense"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
         from agents.intersection_agent import Direction
         
         # Simuler une situation avec des files d'attente
-        intersection.queue_lengths[Direction.NORTH] = 5
-        intersection.queue_lengths[Direction.SOUTH] = 3
-        intersection.queue_lengths[Direction.EAST] = 2
-        intersection.queue_lengths[Direction.WEST] = 1
+        fresh_intersection.queue_lengths[Direction.NORTH] = 5
+        fresh_intersection.queue_lengths[Direction.SOUTH] = 3
+        fresh_intersection.queue_lengths[Direction.EAST] = 2
+        fresh_intersection.queue_lengths[Direction.WEST] = 1
         
         # Définir l'état précédent avec plus de véhicules en attente
-        intersection.previous_total_waiting = 20.0
+        fresh_intersection.previous_total_waiting = 20.0
         
-        reward = intersection._compute_reward()
+        reward = fresh_intersection._compute_reward()
         
         # La récompense doit être positive car les files ont diminué (20 -> 11)
         assert reward > 0
@@ -553,53 +541,41 @@ class TestContractNetProtocol:
 class TestIntersectionEmergency:
     """Tests pour la gestion d'urgence dans les intersections"""
     
-    def test_force_green(self):
+    def test_force_green(self, fresh_intersection):
         """Test le forçage du feu vert dans une direction"""
-        model = MockModel()
-        
-        intersection = IntersectionAgent(
-            unique_id="intersection_1",
-            model=model,
-            position=(500, 500)
-        )
-        
         from agents.intersection_agent import Direction, TrafficLightState
         
         # Forcer le vert vers l'Est
-        intersection._force_green(Direction.EAST)
+        fresh_intersection._force_green(Direction.EAST)
         
         # Est et Ouest doivent être verts
-        assert intersection.traffic_lights[Direction.EAST] == TrafficLightState.GREEN
-        assert intersection.traffic_lights[Direction.WEST] == TrafficLightState.GREEN
+        assert fresh_intersection.traffic_lights[Direction.EAST] == TrafficLightState.GREEN
+        assert fresh_intersection.traffic_lights[Direction.WEST] == TrafficLightState.GREEN
         
         # Nord et Sud doivent être rouges
-        assert intersection.traffic_lights[Direction.NORTH] == TrafficLightState.RED
-        assert intersection.traffic_lights[Direction.SOUTH] == TrafficLightState.RED
+        assert fresh_intersection.traffic_lights[Direction.NORTH] == TrafficLightState.RED
+        assert fresh_intersection.traffic_lights[Direction.SOUTH] == TrafficLightState.RED
 
 
 class TestVehicleType:
     """Tests pour les types de véhicules"""
     
-    def test_standard_vehicle(self):
+    def test_standard_vehicle(self, mock_model):
         """Test la création d'un véhicule standard"""
-        model = MockModel()
-        
         vehicle = VehicleAgent(
             unique_id="vehicle_1",
-            model=model,
+            model=mock_model,
             position=(0, 0),
             destination=(100, 100)
         )
         
         assert vehicle.vehicle_type == "standard"
     
-    def test_emergency_vehicle(self):
+    def test_emergency_vehicle(self, mock_model):
         """Test la création d'un véhicule d'urgence"""
-        model = MockModel()
-        
         ambulance = VehicleAgent(
             unique_id="ambulance_1",
-            model=model,
+            model=mock_model,
             position=(0, 0),
             destination=(100, 100),
             vehicle_type="ambulance"
@@ -607,13 +583,11 @@ class TestVehicleType:
         
         assert ambulance.vehicle_type == "ambulance"
     
-    def test_bus_sotra(self):
+    def test_bus_sotra(self, mock_model):
         """Test la création d'un bus SOTRA"""
-        model = MockModel()
-        
         bus = VehicleAgent(
             unique_id="bus_1",
-            model=model,
+            model=mock_model,
             position=(0, 0),
             destination=(100, 100),
             vehicle_type="bus_sotra"
@@ -665,6 +639,32 @@ class TestScenarios:
         assert isinstance(dest, tuple)
         assert len(dest) == 2
     
+    def test_alias_table_matches_zone_weights(self):
+        """Test que le tirage par table d'alias respecte les poids des zones"""
+        import random
+        from collections import Counter
+        from scenarios.rush_hour import _select_zone
+        
+        zones = [
+            {'name': 'Yopougon', 'weight': 0.45},
+            {'name': 'Abobo', 'weight': 0.3},
+            {'name': 'Cocody', 'weight': 0.15},
+            {'name': 'Marcory', 'weight': 0.1},
+            {'name': 'Treichville', 'weight': 0.0},
+        ]
+        scenario_info = {'origin_zones': zones}
+        
+        random.seed(0)
+        n_draws = 100_000
+        counts = Counter(_select_zone(scenario_info, 'origin_zones')['name']
+                         for _ in range(n_draws))
+        
+        total_weight = sum(zone['weight'] for zone in zones)
+        for zone in zones:
+            expected = zone['weight'] / total_weight
+            assert counts[zone['name']] / n_draws == pytest.approx(expected, abs=0.01)
+        assert counts['Treichville'] == 0
+    
     def test_incident_scenario_creation(self):
         """Test la création du scénario d'incident"""
         from scenarios.incident import IncidentScenario
@@ -703,6 +703,105 @@ class TestScenarios:
         assert scenario.alternative_road_name == 'Pont HKB'
 
 
+class _FakeCopy:
+    """COPY simulé : échoue pour les tables listées dans failing"""
+    def __init__(self, pool, table):
+        self.pool, self.table = pool, table
+    
+    def __enter__(self):
+        self.pool.attempts[self.table] += 1
+        if self.table in self.pool.failing:
+            raise RuntimeError("COPY refusé")
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def write_row(self, row):
+        self.pool.written[self.table].append(row)
+
+
+class _FakePool:
+    """Pool de connexions simulé (sans serveur PostgreSQL)"""
+    def __init__(self, failing=()):
+        from collections import Counter, defaultdict
+        self.failing = set(failing)
+        self.attempts = Counter()
+        self.written = defaultdict(list)
+    
+    @contextlib.contextmanager
+    def connection(self):
+        yield self
+    
+    @contextlib.contextmanager
+    def cursor(self):
+        yield self
+    
+    def copy(self, statement):
+        return _FakeCopy(self, statement.split()[1])
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def buffered_db(monkeypatch, config_path):
+    """PostgreSQLDatabase dont le pool est remplacé par _FakePool"""
+    from utils.database import PostgreSQLDatabase
+    monkeypatch.setattr(PostgreSQLDatabase, 'initialize_pool', lambda self: None)
+    monkeypatch.setattr(PostgreSQLDatabase, 'create_tables', lambda self: None)
+    db = PostgreSQLDatabase(config_path)
+    db.connection_pool = _FakePool(failing={'fipa_messages'})
+    db.flush_interval = 0.01
+    db.retry_interval = 0.1
+    yield db
+    db.connection_pool.failing.clear()
+    db.close()
+
+
+class TestDatabaseBuffering:
+    """Tests de l'écriture en arrière-plan (tampons par table)"""
+    
+    def _message(self):
+        from communication.fipa_message import FIPAMessage, Performative
+        return FIPAMessage(sender="a", receiver="b", performative=Performative.INFORM.value,
+                           content={"k": 1})
+    
+    def test_failed_table_is_retried_while_others_flow(self, buffered_db):
+        """Une table en échec est retentée même si les autres s'écrivent en continu"""
+        pool = buffered_db.connection_pool
+        buffered_db.insert_message(1, self._message())
+        for step in range(50):
+            buffered_db.insert_kpi_snapshot(1, step, {})
+            time.sleep(0.01)
+        
+        with pytest.raises(RuntimeError):
+            buffered_db.flush()
+        assert len(pool.written['kpis_timeseries']) == 50
+        assert pool.attempts['fipa_messages'] >= 3
+        
+        # Reprise : les lignes conservées finissent en base
+        pool.failing.clear()
+        time.sleep(3 * buffered_db.retry_interval)
+        buffered_db.flush()
+        assert len(pool.written['fipa_messages']) == 1
+    
+    def test_failed_table_buffer_is_bounded(self, buffered_db):
+        """Le tampon d'une table en échec ne dépasse pas sa taille maximale"""
+        buffered_db.insert_message(1, self._message())
+        with pytest.raises(RuntimeError):
+            buffered_db.flush()
+        
+        maxlen = buffered_db._buffers['fipa_messages'].maxlen
+        buffered_db._buffers['fipa_messages'].extend([()] * (maxlen - 1))
+        for _ in range(10):
+            buffered_db.insert_message(1, self._message())
+        with pytest.raises(RuntimeError):
+            buffered_db.flush()
+        
+        assert len(buffered_db._buffers['fipa_messages']) == maxlen
+
+
 # Fonction pour exécuter tous les tests
 def run_all_tests():
     """Exécute tous les tests"""
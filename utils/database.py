@@ -4,14 +4,120 @@ Stockage et récupération des données de simulation
 """
 import psycopg
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
 from psycopg_pool import ConnectionPool
-from typing import List, Dict, Optional, Any
-import json
+from typing import Iterator, List, Dict, Optional, Any
+from collections import Counter, defaultdict, deque
+import functools
+import os
+import numpy as np
+import queue
+import threading
+import time
 from datetime import datetime
 from loguru import logger
 import yaml
 
 
+# Nombre maximal de lignes en attente d'écriture avant de bloquer l'appelant
+_WRITE_QUEUE_SIZE = 100000
+
+# Sentinelle d'arrêt du thread d'écriture
+_WRITER_STOP = object()
+
+# Colonnes modifiables par update_simulation et requête correspondante
+_SIMULATION_UPDATABLE = (
+    'simulation_name', 'scenario', 'end_time', 'duration_seconds', 'num_vehicles',
+    'num_intersections', 'algorithm_routing', 'algorithm_traffic_light', 'config', 'status'
+)
+_UPDATE_SIMULATION_QUERY = (
+    "UPDATE simulations SET "
+    + ", ".join(f"{column} = COALESCE(%({column})s, {column})" for column in _SIMULATION_UPDATABLE)
+    + " WHERE simulation_id = %(simulation_id)s"
+)
+
+# Lignes lues par aller-retour par les curseurs serveur (lectures en flux)
+_STREAM_BATCH = 10000
+
+# Colonnes retournées par les lectures
+_SIMULATION_COLUMNS = (
+    'simulation_id, simulation_name, scenario, start_time, end_time, duration_seconds, '
+    'num_vehicles, num_intersections, algorithm_routing, algorithm_traffic_light, config, status'
+)
+_KPI_COLUMNS = (
+    'step, timestamp, average_travel_time, average_queue_length, total_messages, '
+    'active_vehicles, vehicles_arrived, average_speed, congestion_level'
+)
+# Série des KPIs en colonnes : (colonne, dtype numpy) ; NULL -> NaN
+_KPI_DTYPES = (
+    ('step', np.int32),
+    ('timestamp', 'datetime64[us]'),
+    ('average_travel_time', np.float32),
+    ('average_queue_length', np.float32),
+    ('total_messages', np.float32),
+    ('active_vehicles', np.float32),
+    ('vehicles_arrived', np.float32),
+    ('average_speed', np.float32),
+    ('congestion_level', np.float32),
+)
+_VEHICLE_COLUMNS = (
+    'vehicle_id, vehicle_unique_id, origin_x, origin_y, destination_x, destination_y, '
+    'creation_time, arrival_time, total_travel_time, distance_traveled, average_speed, '
+    'route_changes, stops_count, reached_destination'
+)
+_INTERSECTION_COLUMNS = (
+    'intersection_id, intersection_unique_id, position_x, position_y, '
+    'total_vehicles_processed, average_waiting_time, phase_changes, coordination_messages'
+)
+
+# Séquences des tables à fort volume d'insertion : (table, colonne identité)
+_CACHED_SEQUENCES = (
+    ('vehicles', 'vehicle_id'),
+    ('intersections', 'intersection_id'),
+    ('kpis_timeseries', 'kpi_id'),
+    ('fipa_messages', 'message_id'),
+    ('simulation_events', 'event_id'),
+    ('vehicle_positions', 'position_id'),
+)
+
+# Séries temporelles converties en hypertables si TimescaleDB est disponible
+# (vehicle_positions est partitionnée par simulation, voir create_tables)
+_HYPERTABLES = ('kpis_timeseries',)
+
+
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml(path: str, mtime_ns: int) -> Dict:
+    """Lecture mémoïsée d'un fichier YAML ; mtime_ns invalide le cache à chaque modification"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def load_config(config_path: str) -> Dict:
+    """Charge config.yaml (partagé entre instances : à ne pas modifier)"""
+    path = os.path.abspath(config_path)
+    return _load_yaml(path, os.stat(path).st_mtime_ns)
+
+
+def _timed(operation: str):
+    """
+    Décorateur de télémétrie : mesure la durée de chaque appel (perf_counter_ns)
+    quand telemetry_enabled est vrai ; sinon, un simple test d'attribut
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.telemetry_enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._record_timing(operation, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
 class PostgreSQLDatabase:
     """
     Gestionnaire de base de données PostgreSQL pour le système de trafic
@@ -24,6 +130,37 @@ class PostgreSQLDatabase:
     - Analyse des performances
     """
     
+    # Types PostgreSQL des colonnes du COPY binaire de insert_vehicles_batch
+    _VEHICLE_COPY_TYPES = (
+        'int4', 'varchar', 'float8', 'float8', 'float8', 'float8', 'timestamp',
+        'float8', 'float8', 'float8', 'int4', 'int4', 'bool'
+    )
+    
+    # Colonnes des tables alimentées par tampon (voir flush) ; timestamp est fixé
+    # à la mise en tampon, sinon toutes les lignes d'un COPY auraient l'heure de sa transaction
+    _BUFFERED_COLUMNS = {
+        'kpis_timeseries': (
+            'simulation_id', 'step', 'average_travel_time', 'average_queue_length',
+            'total_messages', 'active_vehicles', 'vehicles_arrived',
+            'average_speed', 'congestion_level', 'timestamp'
+        ),
+        'fipa_messages': (
+            'simulation_id', 'sender', 'receiver', 'performative', 'content', 'protocol',
+            'timestamp'
+        ),
+        'vehicle_positions': (
+            'simulation_id', 'vehicle_unique_id', 'step', 'position_x', 'position_y', 'speed',
+            'timestamp'
+        ),
+    }
+    
+    # Nombre de lignes en tampon déclenchant l'écriture, par table
+    _BUFFER_LIMITS = {
+        'kpis_timeseries': 500,
+        'fipa_messages': 10000,
+        'vehicle_positions': 10000,
+    }
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialise la connexion à PostgreSQL
@@ -32,18 +169,50 @@ class PostgreSQLDatabase:
             config_path: Chemin vers le fichier de configuration
         """
         # Charger la configuration
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        config = load_config(config_path)
         
         self.db_config = config['database']['postgresql']
         
+        # Écriture en arrière-plan : les insert_* déposent leurs lignes dans une file,
+        # un thread les regroupe par table ({table: [ligne, ...]}, propres au thread)
+        # et les écrit par COPY quand une table atteint sa limite ou toutes les
+        # flush_interval secondes
+        self.buffer_limits = dict(self._BUFFER_LIMITS)
+        self.flush_interval = 0.1
+        self._buffers: Dict[str, deque] = {
+            table: self._new_buffer() for table in self._BUFFERED_COLUMNS
+        }
+        self._write_queue: queue.Queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        # Tables dont la dernière écriture a échoué : leurs lignes restent en tampon
+        # et sont retentées toutes les retry_interval secondes ; flush() lève l'erreur
+        self.retry_interval = 5.0
+        self._write_errors: Dict[str, Exception] = {}
+        self._rows_dropped: Counter = Counter()
+        
+        # Télémétrie par opération (database.postgresql.telemetry dans config.yaml),
+        # journalisée puis remise à zéro toutes les telemetry_interval secondes
+        self.telemetry_enabled = bool(self.db_config.get('telemetry', False))
+        self.telemetry_interval = 60.0
+        self._timings: Dict[str, List[int]] = defaultdict(list)
+        self._rows_written: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self._stats_since = time.monotonic()
+        
         # Pool de connexions
         self.connection_pool = None
+        self.timescale_enabled = False
+        self.positions_partitioned = False
         self.initialize_pool()
         
         # Créer les tables si elles n'existent pas
         self.create_tables()
         
+        self._writer = threading.Thread(
+            target=self._drain_loop, name="postgresql-writer", daemon=True
+        )
+        self._writer.start()
+        
         logger.info("✅ Connexion PostgreSQL établie")
     
     def initialize_pool(self):
@@ -56,174 +225,294 @@ class PostgreSQLDatabase:
                 f"user={self.db_config['user']} "
                 f"password={self.db_config['password']}"
             )
+            # prepare_threshold=0 : requêtes préparées côté serveur dès la
+            # première exécution (les INSERT répétés ne sont plus réanalysés)
             self.connection_pool = ConnectionPool(
                 conninfo=conninfo,
-                min_size=1,
-                max_size=10
+                min_size=self.db_config.get('pool_min_size', 4),
+                max_size=self.db_config.get('pool_max_size', 32),
+                kwargs={'prepare_threshold': 0},
+                configure=self._configure_connection
             )
             logger.info(f"Pool de connexions PostgreSQL créé: {self.db_config['database']}")
         except Exception as e:
             logger.error(f"Erreur lors de la création du pool: {e}")
             raise
     
-    def get_connection(self):
-        """Récupère une connexion du pool"""
-        return self.connection_pool.getconn()
-    
-    def release_connection(self, conn):
-        """Libère une connexion vers le pool"""
-        self.connection_pool.putconn(conn)
+    @staticmethod
+    def _configure_connection(conn):
+        """
+        Réglages de session appliqués à chaque connexion du pool.
+        synchronous_commit=off : un crash du serveur peut perdre les dernières
+        centaines de ms de commits (jamais corrompre la base), acceptable pour
+        des journaux de simulation rejouables.
+        """
+        conn.execute("SET synchronous_commit = off")
+        conn.execute("SET jit = off")
+        conn.execute("SET work_mem = '64MB'")
+        conn.commit()
     
     def create_tables(self):
         """Crée toutes les tables nécessaires"""
-        conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            
-            # Table des simulations
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS simulations (
-                    simulation_id SERIAL PRIMARY KEY,
-                    simulation_name VARCHAR(255),
-                    scenario VARCHAR(100),
-                    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    end_time TIMESTAMP,
-                    duration_seconds INTEGER,
-                    num_vehicles INTEGER,
-                    num_intersections INTEGER,
-                    algorithm_routing VARCHAR(50),
-                    algorithm_traffic_light VARCHAR(50),
-                    config JSONB,
-                    status VARCHAR(50) DEFAULT 'running'
-                )
-            """)
-            
-            # Table des véhicules
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS vehicles (
-                    vehicle_id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES simulations(simulation_id),
-                    vehicle_unique_id VARCHAR(100),
-                    origin_x FLOAT,
-                    origin_y FLOAT,
-                    destination_x FLOAT,
-                    destination_y FLOAT,
-                    creation_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    arrival_time TIMESTAMP,
-                    total_travel_time FLOAT,
-                    distance_traveled FLOAT,
-                    average_speed FLOAT,
-                    route_changes INTEGER,
-                    stops_count INTEGER,
-                    reached_destination BOOLEAN
-                )
-            """)
-            
-            # Table des intersections
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS intersections (
-                    intersection_id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES simulations(simulation_id),
-                    intersection_unique_id VARCHAR(100),
-                    position_x FLOAT,
-                    position_y FLOAT,
-                    total_vehicles_processed INTEGER,
-                    average_waiting_time FLOAT,
-                    phase_changes INTEGER,
-                    coordination_messages INTEGER
-                )
-            """)
-            
-            # Table des KPIs par pas de temps
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS kpis_timeseries (
-                    kpi_id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES simulations(simulation_id),
-                    step INTEGER,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    average_travel_time FLOAT,
-                    average_queue_length FLOAT,
-                    total_messages INTEGER,
-                    active_vehicles INTEGER,
-                    vehicles_arrived INTEGER,
-                    average_speed FLOAT,
-                    congestion_level FLOAT
-                )
-            """)
-            
-            # Table des messages FIPA
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS fipa_messages (
-                    message_id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES simulations(simulation_id),
-                    sender VARCHAR(100),
-                    receiver VARCHAR(100),
-                    performative VARCHAR(50),
-                    content JSONB,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    protocol VARCHAR(100)
-                )
-            """)
-            
-            # Table des événements de simulation
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS simulation_events (
-                    event_id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES simulations(simulation_id),
-                    event_type VARCHAR(100),
-                    event_data JSONB,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table des positions des véhicules (pour replay/animation)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS vehicle_positions (
-                    position_id SERIAL PRIMARY KEY,
-                    simulation_id INTEGER REFERENCES simulations(simulation_id),
-                    vehicle_unique_id VARCHAR(100),
-                    step INTEGER,
-                    position_x FLOAT,
-                    position_y FLOAT,
-                    speed FLOAT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Créer des index pour améliorer les performances
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_vehicles_simulation 
-                ON vehicles(simulation_id)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_kpis_simulation 
-                ON kpis_timeseries(simulation_id)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_messages_simulation 
-                ON fipa_messages(simulation_id)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_positions_simulation 
-                ON vehicle_positions(simulation_id, step)
-            """)
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                # Table des simulations
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS simulations (
+                        simulation_id SERIAL PRIMARY KEY,
+                        simulation_name VARCHAR(255),
+                        scenario VARCHAR(100),
+                        start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        end_time TIMESTAMP,
+                        duration_seconds INTEGER,
+                        num_vehicles INTEGER,
+                        num_intersections INTEGER,
+                        algorithm_routing VARCHAR(50),
+                        algorithm_traffic_light VARCHAR(50),
+                        config JSONB,
+                        status VARCHAR(50) DEFAULT 'running'
+                    )
+                """)
+                
+                # Table des véhicules
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS vehicles (
+                        vehicle_id BIGINT GENERATED BY DEFAULT AS IDENTITY (CACHE 1000) PRIMARY KEY,
+                        simulation_id INTEGER REFERENCES simulations(simulation_id),
+                        vehicle_unique_id VARCHAR(100),
+                        origin_x FLOAT,
+                        origin_y FLOAT,
+                        destination_x FLOAT,
+                        destination_y FLOAT,
+                        creation_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        arrival_time TIMESTAMP,
+                        total_travel_time FLOAT,
+                        distance_traveled FLOAT,
+                        average_speed FLOAT,
+                        route_changes INTEGER,
+                        stops_count INTEGER,
+                        reached_destination BOOLEAN
+                    )
+                """)
+                
+                # Table des intersections
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS intersections (
+                        intersection_id BIGINT GENERATED BY DEFAULT AS IDENTITY (CACHE 1000) PRIMARY KEY,
+                        simulation_id INTEGER REFERENCES simulations(simulation_id),
+                        intersection_unique_id VARCHAR(100),
+                        position_x FLOAT,
+                        position_y FLOAT,
+                        total_vehicles_processed INTEGER,
+                        average_waiting_time FLOAT,
+                        phase_changes INTEGER,
+                        coordination_messages INTEGER
+                    )
+                """)
+                
+                # Table des KPIs par pas de temps
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS kpis_timeseries (
+                        kpi_id BIGINT GENERATED BY DEFAULT AS IDENTITY (CACHE 1000),
+                        simulation_id INTEGER REFERENCES simulations(simulation_id),
+                        step INTEGER,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        average_travel_time FLOAT,
+                        average_queue_length FLOAT,
+                        total_messages INTEGER,
+                        active_vehicles INTEGER,
+                        vehicles_arrived INTEGER,
+                        average_speed FLOAT,
+                        congestion_level FLOAT,
+                        PRIMARY KEY (kpi_id, timestamp)
+                    )
+                """)
+                
+                # Table des messages FIPA
+                # UNLOGGED (comme les événements et les positions) : données de
+                # replay/débogage, pas d'écriture WAL ; vidées après un crash du serveur
+                cursor.execute("""
+                    CREATE UNLOGGED TABLE IF NOT EXISTS fipa_messages (
+                        message_id BIGINT GENERATED BY DEFAULT AS IDENTITY (CACHE 1000) PRIMARY KEY,
+                        simulation_id INTEGER REFERENCES simulations(simulation_id),
+                        sender VARCHAR(100),
+                        receiver VARCHAR(100),
+                        performative VARCHAR(50),
+                        content JSONB,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        protocol VARCHAR(100)
+                    )
+                """)
+                
+                # Table des événements de simulation
+                cursor.execute("""
+                    CREATE UNLOGGED TABLE IF NOT EXISTS simulation_events (
+                        event_id BIGINT GENERATED BY DEFAULT AS IDENTITY (CACHE 1000) PRIMARY KEY,
+                        simulation_id INTEGER REFERENCES simulations(simulation_id),
+                        event_type VARCHAR(100),
+                        event_data JSONB,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Table des positions des véhicules (pour replay/animation)
+                # Une partition par simulation (créée par create_simulation) :
+                # index bornés et suppression d'une simulation par DROP TABLE
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS vehicle_positions (
+                        position_id BIGINT GENERATED BY DEFAULT AS IDENTITY (CACHE 1000),
+                        simulation_id INTEGER NOT NULL REFERENCES simulations(simulation_id),
+                        vehicle_unique_id VARCHAR(100),
+                        step INTEGER,
+                        position_x FLOAT,
+                        position_y FLOAT,
+                        speed FLOAT,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (position_id, simulation_id)
+                    ) PARTITION BY LIST (simulation_id)
+                """)
+                
+                # Bases créées avant le partitionnement : table classique conservée
+                cursor.execute("""
+                    SELECT 1 FROM pg_partitioned_table
+                    WHERE partrelid = 'vehicle_positions'::regclass
+                """)
+                self.positions_partitioned = cursor.fetchone() is not None
+                if self.positions_partitioned:
+                    cursor.execute("""
+                        CREATE UNLOGGED TABLE IF NOT EXISTS vehicle_positions_default
+                        PARTITION OF vehicle_positions DEFAULT
+                    """)
+                
+                # Créer des index pour améliorer les performances
+                # (INCLUDE : parcours d'index seul pour les agrégats de statistiques)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vehicles_sim_reached 
+                    ON vehicles(simulation_id)
+                    INCLUDE (reached_destination, total_travel_time, distance_traveled,
+                             average_speed, route_changes)
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_kpis_sim_step 
+                    ON kpis_timeseries(simulation_id, step)
+                    INCLUDE (congestion_level, average_travel_time)
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_messages_simulation 
+                    ON fipa_messages(simulation_id)
+                """)
+                
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_positions_simulation 
+                    ON vehicle_positions(simulation_id, step)
+                """)
+                
+                # Replay d'un véhicule
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_positions_sim_vehicle_step 
+                    ON vehicle_positions(simulation_id, vehicle_unique_id, step)
+                """)
+                
+                # Résumé par simulation pour compare_simulations (rafraîchi par
+                # end_simulation) ; agrégats calculés avant la jointure
+                cursor.execute("""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS simulation_summary AS
+                    SELECT 
+                        s.simulation_id,
+                        s.simulation_name,
+                        s.scenario,
+                        s.algorithm_routing,
+                        s.algorithm_traffic_light,
+                        v.avg_travel_time,
+                        k.avg_congestion
+                    FROM simulations s
+                    LEFT JOIN (
+                        SELECT simulation_id, AVG(total_travel_time) AS avg_travel_time
+                        FROM vehicles GROUP BY simulation_id
+                    ) v ON v.simulation_id = s.simulation_id
+                    LEFT JOIN (
+                        SELECT simulation_id, AVG(congestion_level) AS avg_congestion
+                        FROM kpis_timeseries GROUP BY simulation_id
+                    ) k ON k.simulation_id = s.simulation_id
+                """)
+                
+                # Index unique requis par REFRESH ... CONCURRENTLY
+                cursor.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_simulation_summary_id 
+                    ON simulation_summary(simulation_id)
+                """)
+                
+                # Bases existantes (colonnes SERIAL) : cache de séquence de 1000 valeurs
+                for table, column in _CACHED_SEQUENCES:
+                    cursor.execute(f"ALTER SEQUENCE IF EXISTS {table}_{column}_seq CACHE 1000")
+                
+                self.timescale_enabled = self._create_hypertables(conn, cursor)
             
-            conn.commit()
             logger.info("✅ Tables PostgreSQL créées/vérifiées")
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur création tables: {e}")
             raise
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+    
+    def _create_hypertables(self, conn, cursor) -> bool:
+        """
+        Convertit les séries temporelles en hypertables TimescaleDB compressées
+        (segmentées par simulation). Sans l'extension, les tables restent
+        des tables PostgreSQL classiques.
+        
+        Returns:
+            True si TimescaleDB est actif
+        """
+        cursor.execute("""
+            SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'
+        """)
+        if cursor.fetchone() is None:
+            return False
+        
+        try:
+            # Point de sauvegarde : un échec n'annule pas la création des tables
+            with conn.transaction():
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+                
+                for table in _HYPERTABLES:
+                    cursor.execute("""
+                        SELECT compression_enabled
+                        FROM timescaledb_information.hypertables
+                        WHERE hypertable_name = %s
+                    """, (table,))
+                    row = cursor.fetchone()
+                    if row and row[0]:
+                        continue
+                    
+                    cursor.execute("""
+                        SELECT create_hypertable(%s, 'timestamp',
+                            chunk_time_interval => INTERVAL '1 day',
+                            if_not_exists => TRUE,
+                            migrate_data => TRUE)
+                    """, (table,))
+                    cursor.execute(f"""
+                        ALTER TABLE {table} SET (
+                            timescaledb.compress,
+                            timescaledb.compress_segmentby = 'simulation_id'
+                        )
+                    """)
+                    cursor.execute("""
+                        SELECT add_compression_policy(%s, INTERVAL '7 days',
+                            if_not_exists => TRUE)
+                    """, (table,))
+        
+        except psycopg.Error as e:
+            logger.warning(f"⚠️ TimescaleDB indisponible, tables classiques conservées: {e}")
+            return False
+        
+        logger.info("✅ Hypertables TimescaleDB actives: " + ", ".join(_HYPERTABLES))
+        return True
     
     # ============ GESTION DES SIMULATIONS ============
     
+    @_timed('create_simulation')
     def create_simulation(self, simulation_name: str, scenario: str, 
                          config: Dict) -> int:
         """
@@ -232,357 +521,485 @@ class PostgreSQLDatabase:
         Returns:
             simulation_id
         """
-        conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO simulations 
-                (simulation_name, scenario, num_vehicles, num_intersections, 
-                 algorithm_routing, algorithm_traffic_light, config)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                RETURNING simulation_id
-            """, (
-                simulation_name,
-                scenario,
-                config.get('simulation', {}).get('num_vehicles', 0),
-                0,  # Sera mis à jour plus tard
-                config.get('algorithms', {}).get('routing', {}).get('algorithm', 'A_STAR'),
-                config.get('algorithms', {}).get('traffic_light', {}).get('algorithm', 'Q_LEARNING'),
-                json.dumps(config)
-            ))
-            
-            simulation_id = cursor.fetchone()[0]
-            conn.commit()
-            
-            logger.info(f"✅ Simulation créée avec ID: {simulation_id}")
-            return simulation_id
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO simulations 
+                    (simulation_name, scenario, num_vehicles, num_intersections, 
+                     algorithm_routing, algorithm_traffic_light, config)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    RETURNING simulation_id
+                """, (
+                    simulation_name,
+                    scenario,
+                    config.get('simulation', {}).get('num_vehicles', 0),
+                    0,  # Sera mis à jour plus tard
+                    config.get('algorithms', {}).get('routing', {}).get('algorithm', 'A_STAR'),
+                    config.get('algorithms', {}).get('traffic_light', {}).get('algorithm', 'Q_LEARNING'),
+                    Jsonb(config)
+                ))
+                
+                simulation_id = cursor.fetchone()[0]
+                
+                if self.positions_partitioned:
+                    cursor.execute(psycopg.sql.SQL(
+                        "CREATE UNLOGGED TABLE IF NOT EXISTS {} PARTITION OF vehicle_positions "
+                        "FOR VALUES IN ({})"
+                    ).format(
+                        psycopg.sql.Identifier(f"vehicle_positions_{simulation_id}"),
+                        psycopg.sql.Literal(simulation_id)
+                    ), prepare=False)
+                
+                logger.info(f"✅ Simulation créée avec ID: {simulation_id}")
+                return simulation_id
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur création simulation: {e}")
             raise
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
+    @_timed('update_simulation')
     def update_simulation(self, simulation_id: int, **kwargs):
-        """Met à jour une simulation"""
-        conn = self.get_connection()
+        """
+        Met à jour une simulation
+        
+        Seules les colonnes de _SIMULATION_UPDATABLE sont acceptées ; une
+        colonne absente (ou None) garde sa valeur (requête unique, préparée)
+        """
+        unknown = set(kwargs) - set(_SIMULATION_UPDATABLE)
+        if unknown:
+            logger.error(f"❌ Colonnes de simulation inconnues: {', '.join(sorted(unknown))}")
+            return
+        
+        params = {column: kwargs.get(column) for column in _SIMULATION_UPDATABLE}
+        if params['config'] is not None:
+            params['config'] = Jsonb(params['config'])
+        params['simulation_id'] = simulation_id
+        
         try:
-            cursor = conn.cursor()
-            
-            # Construire la requête dynamiquement
-            update_fields = []
-            values = []
-            
-            for key, value in kwargs.items():
-                update_fields.append(f"{key} = %s")
-                values.append(value)
-            
-            if update_fields:
-                values.append(simulation_id)
-                query = f"""
-                    UPDATE simulations 
-                    SET {', '.join(update_fields)}
-                    WHERE simulation_id = %s
-                """
-                cursor.execute(query, values)
-                conn.commit()
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute(_UPDATE_SIMULATION_QUERY, params)
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur mise à jour simulation: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
-    def end_simulation(self, simulation_id: int, duration_seconds: int):
-        """Marque une simulation comme terminée"""
-        conn = self.get_connection()
+    @_timed('end_simulation')
+    def end_simulation(self, simulation_id: int, duration_seconds: int,
+                       keep_replay: bool = False):
+        """
+        Marque une simulation comme terminée
+        
+        Args:
+            keep_replay: Rendre la partition de positions durable (SET LOGGED)
+                         pour qu'elle survive à un redémarrage du serveur
+        """
         try:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE simulations
-                SET end_time = CURRENT_TIMESTAMP,
-                    duration_seconds = %s,
-                    status = 'completed'
-                WHERE simulation_id = %s
-            """, (int(duration_seconds), simulation_id))
-            conn.commit()
-            logger.info(f"✅ Simulation {simulation_id} terminée")
+            self.flush()
+        except RuntimeError as e:
+            # Lignes conservées pour reprise : la simulation est tout de même clôturée
+            logger.error(f"❌ Erreur écriture avant fin simulation: {e}")
+        try:
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE simulations
+                    SET end_time = CURRENT_TIMESTAMP,
+                        duration_seconds = %s,
+                        status = 'completed'
+                    WHERE simulation_id = %s
+                """, (int(duration_seconds), simulation_id))
+                
+                if keep_replay and self.positions_partitioned:
+                    cursor.execute(psycopg.sql.SQL("ALTER TABLE {} SET LOGGED").format(
+                        psycopg.sql.Identifier(f"vehicle_positions_{simulation_id}")
+                    ), prepare=False)
+                logger.info(f"✅ Simulation {simulation_id} terminée")
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur fin simulation: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+        
+        self.refresh_simulation_summary()
+    
+    def refresh_simulation_summary(self):
+        """Recalcule la vue simulation_summary sans bloquer ses lecteurs"""
+        try:
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY simulation_summary")
+        except Exception as e:
+            logger.error(f"❌ Erreur rafraîchissement simulation_summary: {e}")
+    
+    def drop_vehicle_positions(self, simulation_id: int):
+        """Supprime les positions enregistrées d'une simulation (DROP de sa partition)"""
+        try:
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                if self.positions_partitioned:
+                    cursor.execute(psycopg.sql.SQL("DROP TABLE IF EXISTS {}").format(
+                        psycopg.sql.Identifier(f"vehicle_positions_{simulation_id}")
+                    ), prepare=False)
+                else:
+                    cursor.execute("""
+                        DELETE FROM vehicle_positions WHERE simulation_id = %s
+                    """, (simulation_id,))
+            
+            logger.info(f"✅ Positions de la simulation {simulation_id} supprimées")
+        except Exception as e:
+            logger.error(f"❌ Erreur suppression positions: {e}")
     
     # ============ INSERTION DES DONNÉES ============
     
+    @_timed('insert_vehicle')
     def insert_vehicle(self, simulation_id: int, vehicle_data: Dict):
         """Insère les données d'un véhicule"""
-        conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO vehicles 
-                (simulation_id, vehicle_unique_id, origin_x, origin_y, 
-                 destination_x, destination_y, arrival_time, total_travel_time,
-                 distance_traveled, average_speed, route_changes, 
-                 stops_count, reached_destination)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                simulation_id,
-                vehicle_data['id'],
-                vehicle_data.get('origin_x'),
-                vehicle_data.get('origin_y'),
-                vehicle_data.get('destination_x'),
-                vehicle_data.get('destination_y'),
-                datetime.now() if vehicle_data.get('reached_destination') else None,
-                vehicle_data.get('travel_time'),
-                vehicle_data.get('distance_traveled'),
-                vehicle_data.get('average_speed'),
-                vehicle_data.get('route_changes'),
-                vehicle_data.get('stops_count'),
-                vehicle_data.get('reached_destination')
-            ))
-            
-            conn.commit()
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO vehicles 
+                    (simulation_id, vehicle_unique_id, origin_x, origin_y, 
+                     destination_x, destination_y, arrival_time, total_travel_time,
+                     distance_traveled, average_speed, route_changes, 
+                     stops_count, reached_destination)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    simulation_id,
+                    vehicle_data['id'],
+                    vehicle_data.get('origin_x'),
+                    vehicle_data.get('origin_y'),
+                    vehicle_data.get('destination_x'),
+                    vehicle_data.get('destination_y'),
+                    datetime.now() if vehicle_data.get('reached_destination') else None,
+                    vehicle_data.get('travel_time'),
+                    vehicle_data.get('distance_traveled'),
+                    vehicle_data.get('average_speed'),
+                    vehicle_data.get('route_changes'),
+                    vehicle_data.get('stops_count'),
+                    vehicle_data.get('reached_destination')
+                ))
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur insertion véhicule: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
+    @_timed('insert_vehicles_batch')
     def insert_vehicles_batch(self, simulation_id: int, vehicles_data: List[Dict]):
         """Insère plusieurs véhicules en batch (plus performant)"""
-        conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            
-            values = [
-                (
-                    simulation_id,
-                    v['id'],
-                    v.get('origin_x'),
-                    v.get('origin_y'),
-                    v.get('destination_x'),
-                    v.get('destination_y'),
-                    datetime.now() if v.get('reached_destination') else None,
-                    v.get('travel_time'),
-                    v.get('distance_traveled'),
-                    v.get('average_speed'),
-                    v.get('route_changes'),
-                    v.get('stops_count'),
-                    v.get('reached_destination')
-                )
-                for v in vehicles_data
-            ]
-            
-            cursor.executemany("""
-                INSERT INTO vehicles 
-                (simulation_id, vehicle_unique_id, origin_x, origin_y, 
-                 destination_x, destination_y, arrival_time, total_travel_time,
-                 distance_traveled, average_speed, route_changes, 
-                 stops_count, reached_destination)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, values)
-            
-            conn.commit()
-            logger.debug(f"✅ {len(vehicles_data)} véhicules insérés")
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                values = [
+                    (
+                        simulation_id,
+                        v['id'],
+                        v.get('origin_x'),
+                        v.get('origin_y'),
+                        v.get('destination_x'),
+                        v.get('destination_y'),
+                        datetime.now() if v.get('reached_destination') else None,
+                        v.get('travel_time'),
+                        v.get('distance_traveled'),
+                        v.get('average_speed'),
+                        v.get('route_changes'),
+                        v.get('stops_count'),
+                        v.get('reached_destination')
+                    )
+                    for v in vehicles_data
+                ]
+                
+                # COPY binaire : un seul flux pour tout le lot
+                with cursor.copy("""
+                    COPY vehicles 
+                    (simulation_id, vehicle_unique_id, origin_x, origin_y, 
+                     destination_x, destination_y, arrival_time, total_travel_time,
+                     distance_traveled, average_speed, route_changes, 
+                     stops_count, reached_destination)
+                    FROM STDIN WITH (FORMAT BINARY)
+                """) as copy:
+                    copy.set_types(self._VEHICLE_COPY_TYPES)
+                    for row in values:
+                        copy.write_row(row)
+                
+                logger.debug(f"✅ {len(vehicles_data)} véhicules insérés")
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur insertion batch véhicules: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
+    @_timed('insert_intersection')
     def insert_intersection(self, simulation_id: int, intersection_data: Dict):
         """Insère les données d'une intersection"""
-        conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO intersections 
-                (simulation_id, intersection_unique_id, position_x, position_y,
-                 total_vehicles_processed, average_waiting_time, 
-                 phase_changes, coordination_messages)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                simulation_id,
-                intersection_data['id'],
-                intersection_data['position'][0],
-                intersection_data['position'][1],
-                intersection_data.get('total_vehicles_processed'),
-                intersection_data.get('average_waiting_time'),
-                intersection_data.get('phase_changes'),
-                intersection_data.get('coordination_messages')
-            ))
-            
-            conn.commit()
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO intersections 
+                    (simulation_id, intersection_unique_id, position_x, position_y,
+                     total_vehicles_processed, average_waiting_time, 
+                     phase_changes, coordination_messages)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """, (
+                    simulation_id,
+                    intersection_data['id'],
+                    intersection_data['position'][0],
+                    intersection_data['position'][1],
+                    intersection_data.get('total_vehicles_processed'),
+                    intersection_data.get('average_waiting_time'),
+                    intersection_data.get('phase_changes'),
+                    intersection_data.get('coordination_messages')
+                ))
             
         except Exception as e:
-            conn.rollback()
             logger.error(f"❌ Erreur insertion intersection: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
-    def insert_kpi_snapshot(self, simulation_id: int, step: int, kpis: Dict):
-        """Insère un snapshot des KPIs pour un pas de temps"""
-        conn = self.get_connection()
+    @_timed('insert_intersections_batch')
+    def insert_intersections_batch(self, simulation_id: int, intersections_data: List[Dict]):
+        """Insère plusieurs intersections en batch (mode pipeline)"""
         try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO kpis_timeseries 
-                (simulation_id, step, average_travel_time, average_queue_length,
-                 total_messages, active_vehicles, vehicles_arrived, 
-                 average_speed, congestion_level)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                simulation_id,
-                step,
-                kpis.get('Average_Travel_Time'),
-                kpis.get('Average_Queue_Length'),
-                kpis.get('Total_Messages'),
-                kpis.get('Active_Vehicles'),
-                kpis.get('Vehicles_Arrived'),
-                kpis.get('Average_Speed'),
-                kpis.get('Congestion_Level')
-            ))
-            
-            conn.commit()
+            with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                with conn.pipeline():
+                    for data in intersections_data:
+                        cursor.execute("""
+                            INSERT INTO intersections 
+                            (simulation_id, intersection_unique_id, position_x, position_y,
+                             total_vehicles_processed, average_waiting_time, 
+                             phase_changes, coordination_messages)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                        """, (
+                            simulation_id,
+                            data['id'],
+                            data['position'][0],
+                            data['position'][1],
+                            data.get('total_vehicles_processed'),
+                            data.get('average_waiting_time'),
+                            data.get('phase_changes'),
+                            data.get('coordination_messages')
+                        ))
+                
+                logger.debug(f"✅ {len(intersections_data)} intersections insérées")
             
         except Exception as e:
-            conn.rollback()
-            logger.error(f"❌ Erreur insertion KPIs: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+            logger.error(f"❌ Erreur insertion batch intersections: {e}")
     
+    @_timed('insert_kpi_snapshot')
+    def insert_kpi_snapshot(self, simulation_id: int, step: int, kpis: Dict):
+        """Insère un snapshot des KPIs pour un pas de temps (mis en tampon)"""
+        self._buffer_row('kpis_timeseries', (
+            simulation_id,
+            step,
+            kpis.get('Average_Travel_Time'),
+            kpis.get('Average_Queue_Length'),
+            kpis.get('Total_Messages'),
+            kpis.get('Active_Vehicles'),
+            kpis.get('Vehicles_Arrived'),
+            kpis.get('Average_Speed'),
+            kpis.get('Congestion_Level'),
+            datetime.now()
+        ))
+    
+    @_timed('insert_message')
     def insert_message(self, simulation_id: int, message):
-        """Insère un message FIPA"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO fipa_messages 
-                (simulation_id, sender, receiver, performative, content, protocol)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                simulation_id,
-                message.sender,
-                message.receiver,
-                message.performative,
-                json.dumps(message.content),
-                message.protocol
-            ))
-            
-            conn.commit()
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"❌ Erreur insertion message: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+        """Insère un message FIPA (mis en tampon)"""
+        self._buffer_row('fipa_messages', (
+            simulation_id,
+            message.sender,
+            message.receiver,
+            message.performative,
+            Jsonb(message.content),
+            message.protocol,
+            datetime.now()
+        ))
     
+    @_timed('insert_vehicle_position')
     def insert_vehicle_position(self, simulation_id: int, vehicle_id: str, 
                                step: int, position: tuple, speed: float):
-        """Insère la position d'un véhicule (pour animation)"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
+        """Insère la position d'un véhicule (pour animation, mis en tampon)"""
+        self._buffer_row('vehicle_positions', (
+            simulation_id,
+            vehicle_id,
+            step,
+            position[0],
+            position[1],
+            speed,
+            datetime.now()
+        ))
+    
+    # ============ ÉCRITURE EN ARRIÈRE-PLAN ============
+    
+    def _buffer_row(self, table: str, row: tuple):
+        """
+        Confie une ligne au thread d'écriture (n'attend pas la base).
+        Bloque seulement si le thread a _WRITE_QUEUE_SIZE lignes de retard.
+        """
+        self._write_queue.put((table, row))
+    
+    @staticmethod
+    def _new_buffer() -> deque:
+        """
+        Tampon d'une table, borné à _WRITE_QUEUE_SIZE lignes : jamais atteint en
+        fonctionnement normal (limites <= 10000), il borne une table en échec
+        """
+        return deque(maxlen=_WRITE_QUEUE_SIZE)
+    
+    def _drain_loop(self):
+        """
+        Thread d'écriture : regroupe les lignes par table et les écrit
+        quand une table atteint sa limite ou toutes les flush_interval secondes
+        """
+        pending = 0
+        last_flush = last_retry = time.monotonic()
+        
+        while True:
+            try:
+                item = self._write_queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
             
-            cursor.execute("""
-                INSERT INTO vehicle_positions 
-                (simulation_id, vehicle_unique_id, step, position_x, position_y, speed)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                simulation_id,
-                vehicle_id,
-                step,
-                position[0],
-                position[1],
-                speed
-            ))
+            if item is _WRITER_STOP:
+                self._write_queue.task_done()
+                break
             
-            conn.commit()
+            full = False
+            if item is not None:
+                table, row = item
+                buffer = self._buffers[table]
+                if len(buffer) == buffer.maxlen:
+                    self._rows_dropped[table] += 1  # la plus ancienne ligne est évincée
+                buffer.append(row)
+                pending += 1
+                full = (len(buffer) >= self.buffer_limits[table]
+                        and table not in self._write_errors)
             
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"❌ Erreur insertion position: {e}")
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+            now = time.monotonic()
+            # Horloge de reprise distincte : les écritures régulières des autres
+            # tables ne doivent pas repousser indéfiniment la reprise
+            retry_due = bool(self._write_errors) and now - last_retry >= self.retry_interval
+            if retry_due:
+                last_retry = now
+            if (pending and (full or now - last_flush >= self.flush_interval)) or retry_due:
+                self._write_buffers(retry=retry_due)
+                for _ in range(pending):
+                    self._write_queue.task_done()
+                pending = 0
+                last_flush = time.monotonic()
+    
+    @_timed('write_buffers')
+    def _write_buffers(self, retry: bool = False):
+        """
+        Écrit chaque tampon non vide par COPY, une transaction par table :
+        un échec n'affecte que la table concernée, dont les lignes sont conservées
+        
+        Args:
+            retry: Retenter aussi les tables en échec (sinon attendre retry_interval)
+        """
+        for table, rows in self._buffers.items():
+            if not rows or (table in self._write_errors and not retry):
+                continue
+            self._buffers[table] = self._new_buffer()
+            try:
+                with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+                    columns = ', '.join(self._BUFFERED_COLUMNS[table])
+                    with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                        for row in rows:
+                            copy.write_row(row)
+            except Exception as e:
+                logger.error(f"❌ Erreur insertion {table} ({len(rows)} lignes conservées): {e}")
+                dropped = self._rows_dropped.pop(table, 0)
+                if dropped:
+                    logger.error(f"❌ {table} : {dropped} lignes les plus anciennes abandonnées")
+                self._buffers[table] = rows
+                self._write_errors[table] = e
+                continue
+            
+            self._write_errors.pop(table, None)
+            if self.telemetry_enabled:
+                with self._stats_lock:
+                    self._rows_written[table] += len(rows)
+    
+    @_timed('flush')
+    def flush(self):
+        """
+        Attend que toutes les lignes confiées au thread d'écriture soient traitées
+        
+        Raises:
+            RuntimeError: si des lignes n'ont pas pu être écrites (elles restent
+                          en tampon et seront retentées)
+        """
+        self._write_queue.join()
+        if self._write_errors:
+            raise RuntimeError(
+                f"Écriture en échec pour {', '.join(self._write_errors)}"
+            ) from next(iter(self._write_errors.values()))
     
     # ============ RÉCUPÉRATION DES DONNÉES ============
     
+    @_timed('get_simulation')
     def get_simulation(self, simulation_id: int) -> Optional[Dict]:
         """Récupère les informations d'une simulation"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            
-            cursor.execute("""
-                SELECT * FROM simulations WHERE simulation_id = %s
+        with self.connection_pool.connection() as conn, conn.cursor(row_factory=dict_row) as cursor:
+            cursor.execute(f"""
+                SELECT {_SIMULATION_COLUMNS}
+                FROM simulations WHERE simulation_id = %s
             """, (simulation_id,))
             
             result = cursor.fetchone()
             return dict(result) if result else None
-            
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
-    def get_all_simulations(self) -> List[Dict]:
-        """Récupère toutes les simulations"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            
-            cursor.execute("""
-                SELECT * FROM simulations ORDER BY start_time DESC
-            """)
+    @_timed('get_all_simulations')
+    def get_all_simulations(self, limit: Optional[int] = None,
+                            offset: int = 0) -> List[Dict]:
+        """Récupère les simulations, des plus récentes aux plus anciennes"""
+        with self.connection_pool.connection() as conn, conn.cursor(row_factory=dict_row) as cursor:
+            cursor.execute(f"""
+                SELECT {_SIMULATION_COLUMNS} FROM simulations
+                ORDER BY start_time DESC
+                LIMIT %s OFFSET %s
+            """, (limit, offset))
             
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
+    
+    def iter_kpis_timeseries(self, simulation_id: int, limit: Optional[int] = None,
+                             offset: int = 0) -> Iterator[Dict]:
+        """
+        Parcourt la série temporelle des KPIs en flux (curseur serveur) :
+        mémoire constante quelle que soit la durée de la simulation
+        """
+        self.flush()
+        with self.connection_pool.connection() as conn, \
+                conn.cursor(name="kpis_stream", row_factory=dict_row) as cursor:
+            cursor.itersize = _STREAM_BATCH
+            cursor.execute(f"""
+                SELECT {_KPI_COLUMNS} FROM kpis_timeseries 
+                WHERE simulation_id = %s 
+                ORDER BY step
+                LIMIT %s OFFSET %s
+            """, (simulation_id, limit, offset))
             
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+            yield from cursor
     
-    def get_kpis_timeseries(self, simulation_id: int) -> List[Dict]:
+    @_timed('get_kpis_timeseries')
+    def get_kpis_timeseries(self, simulation_id: int, limit: Optional[int] = None,
+                            offset: int = 0) -> List[Dict]:
         """Récupère la série temporelle des KPIs"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            
-            cursor.execute("""
-                SELECT * FROM kpis_timeseries 
+        return list(self.iter_kpis_timeseries(simulation_id, limit, offset))
+    
+    @_timed('get_kpis_timeseries_columnar')
+    def get_kpis_timeseries_columnar(self, simulation_id: int) -> Dict[str, np.ndarray]:
+        """
+        Récupère la série temporelle des KPIs en colonnes numpy
+        ({'step': int32[:], 'average_speed': float32[:], ...}), prête pour
+        matplotlib/pandas sans un dict Python par pas de temps
+        """
+        self.flush()
+        with self.connection_pool.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT {_KPI_COLUMNS} FROM kpis_timeseries 
                 WHERE simulation_id = %s 
                 ORDER BY step
             """, (simulation_id,))
-            
-            return [dict(row) for row in cursor.fetchall()]
-            
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+            rows = cursor.fetchall()
+        
+        columns = zip(*rows) if rows else [()] * len(_KPI_DTYPES)
+        return {
+            name: np.array(values, dtype=dtype)
+            for (name, dtype), values in zip(_KPI_DTYPES, columns)
+        }
     
+    @_timed('get_simulation_statistics')
     def get_simulation_statistics(self, simulation_id: int) -> Dict:
         """Calcule les statistiques agrégées d'une simulation"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            
+        self.flush()
+        with self.connection_pool.connection() as conn, conn.cursor(row_factory=dict_row) as cursor:
             # Statistiques des véhicules
             cursor.execute("""
                 SELECT 
@@ -627,82 +1044,114 @@ class PostgreSQLDatabase:
                 'intersections': intersection_stats,
                 'messages': message_stats
             }
-            
-        finally:
-            cursor.close()
-            self.release_connection(conn)
     
+    @_timed('compare_simulations')
     def compare_simulations(self, simulation_ids: List[int]) -> Dict:
-        """Compare plusieurs simulations"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            
-            placeholders = ','.join(['%s'] * len(simulation_ids))
-            
-            cursor.execute(f"""
+        """
+        Compare plusieurs simulations (vue simulation_summary : les
+        simulations en cours n'y figurent qu'au prochain rafraîchissement)
+        """
+        with self.connection_pool.connection() as conn, conn.cursor(row_factory=dict_row) as cursor:
+            cursor.execute("""
                 SELECT 
-                    s.simulation_id,
-                    s.simulation_name,
-                    s.scenario,
-                    s.algorithm_routing,
-                    s.algorithm_traffic_light,
-                    AVG(v.total_travel_time) as avg_travel_time,
-                    AVG(k.congestion_level) as avg_congestion
-                FROM simulations s
-                LEFT JOIN vehicles v ON s.simulation_id = v.simulation_id
-                LEFT JOIN kpis_timeseries k ON s.simulation_id = k.simulation_id
-                WHERE s.simulation_id IN ({placeholders})
-                GROUP BY s.simulation_id
-            """, simulation_ids)
-            
-            return [dict(row) for row in cursor.fetchall()]
+                    simulation_id,
+                    simulation_name,
+                    scenario,
+                    algorithm_routing,
+                    algorithm_traffic_light,
+                    avg_travel_time,
+                    avg_congestion
+                FROM simulation_summary
+                WHERE simulation_id = ANY(%s)
+            """, (list(simulation_ids),))
             
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+            return cursor.fetchall()
     
-    def get_vehicles(self, simulation_id: int) -> List[Dict]:
-        """Récupère tous les véhicules d'une simulation"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            cursor.execute("""
-                SELECT * FROM vehicles
+    @_timed('get_vehicles')
+    def get_vehicles(self, simulation_id: int, limit: Optional[int] = None,
+                     offset: int = 0) -> List[Dict]:
+        """Récupère les véhicules d'une simulation"""
+        with self.connection_pool.connection() as conn, conn.cursor(row_factory=dict_row) as cursor:
+            cursor.execute(f"""
+                SELECT {_VEHICLE_COLUMNS} FROM vehicles
                 WHERE simulation_id = %s
                 ORDER BY vehicle_id
-            """, (simulation_id,))
-            return [dict(row) for row in cursor.fetchall()]
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+                LIMIT %s OFFSET %s
+            """, (simulation_id, limit, offset))
+            return cursor.fetchall()
 
-    def get_intersections(self, simulation_id: int) -> List[Dict]:
-        """Récupère toutes les intersections d'une simulation"""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor(row_factory=dict_row)
-            cursor.execute("""
-                SELECT * FROM intersections
+    @_timed('get_intersections')
+    def get_intersections(self, simulation_id: int, limit: Optional[int] = None,
+                          offset: int = 0) -> List[Dict]:
+        """Récupère les intersections d'une simulation"""
+        with self.connection_pool.connection() as conn, conn.cursor(row_factory=dict_row) as cursor:
+            cursor.execute(f"""
+                SELECT {_INTERSECTION_COLUMNS} FROM intersections
                 WHERE simulation_id = %s
                 ORDER BY intersection_id
-            """, (simulation_id,))
-            return [dict(row) for row in cursor.fetchall()]
-        finally:
-            cursor.close()
-            self.release_connection(conn)
+                LIMIT %s OFFSET %s
+            """, (simulation_id, limit, offset))
+            return cursor.fetchall()
 
+    # ============ TÉLÉMÉTRIE ============
+    
+    def _record_timing(self, operation: str, elapsed_ns: int):
+        """Enregistre une durée ; journalise et remet à zéro à chaque intervalle"""
+        with self._stats_lock:
+            self._timings[operation].append(elapsed_ns)
+            if time.monotonic() - self._stats_since < self.telemetry_interval:
+                return
+            stats = self._compute_stats()
+            self._reset_stats()
+        
+        for operation, op_stats in sorted(stats.items(), key=lambda item: -item[1]['total_ns']):
+            logger.info(
+                f"📈 DB {operation}: {op_stats['calls']} appels, "
+                f"{op_stats['total_ns'] / 1e6:.1f} ms au total, p99 {op_stats['p99_ns'] / 1e3:.0f} µs"
+            )
+    
+    def _compute_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistiques par opération (appelant détenteur de _stats_lock)"""
+        stats = {}
+        for operation, durations in self._timings.items():
+            stats[operation] = {
+                'calls': len(durations),
+                'total_ns': int(sum(durations)),
+                'p99_ns': int(np.percentile(durations, 99)),
+            }
+        if self._rows_written:
+            write_stats = stats.setdefault('write_buffers', {'calls': 0, 'total_ns': 0, 'p99_ns': 0})
+            write_stats['rows'] = dict(self._rows_written)
+        return stats
+    
+    def _reset_stats(self):
+        self._timings.clear()
+        self._rows_written.clear()
+        self._stats_since = time.monotonic()
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Télémétrie depuis la dernière remise à zéro :
+        {'insert_vehicle_position': {'calls': n, 'total_ns': t, 'p99_ns': p}, ...}
+        ('write_buffers' donne aussi les lignes écrites par table dans 'rows')
+        """
+        with self._stats_lock:
+            return self._compute_stats()
+    
     # ============ NETTOYAGE ============
     
     def close(self):
         """Ferme toutes les connexions"""
+        if self._writer and self._writer.is_alive():
+            try:
+                self.flush()
+            except RuntimeError as e:
+                logger.error(f"❌ Lignes non écrites à la fermeture: {e}")
+            self._write_queue.put(_WRITER_STOP)
+            self._writer.join()
         if self.connection_pool:
             self.connection_pool.close()
             logger.info("✅ Connexions PostgreSQL fermées")
-    
-    def __del__(self):
-        """Destructeur"""
-        self.close()
 
 
 # Fonction helper pour créer la base de données
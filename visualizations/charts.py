@@ -2,19 +2,127 @@
 Module de visualisation pour le système de trafic
 Génère des graphiques et animations
 """
+import matplotlib
+matplotlib.use("Agg")  # backend non interactif : rendu PNG plus rapide
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
-from matplotlib.patches import Rectangle, Circle
-import seaborn as sns
+from matplotlib.patches import Rectangle
 import numpy as np
-import pandas as pd
+from functools import lru_cache
 from typing import List, Tuple
 
+from .charts_numba import bin_positions, NUMBA_AVAILABLE
+
+# Import optionnel de fast-histogram (binning uniforme en C)
+try:
+    from fast_histogram import histogram2d
+    FAST_HISTOGRAM_AVAILABLE = True
+except ImportError:
+    FAST_HISTOGRAM_AVAILABLE = False
+
+# Import optionnel de SciPy (lissage gaussien de la carte de chaleur)
+try:
+    from scipy.ndimage import gaussian_filter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 # Configuration du style
-sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 10)
 plt.rcParams['font.size'] = 10
+_style_initialized = False
+
+
+def _init_style():
+    """Applique le style seaborn au premier visualiseur créé (import de seaborn différé)"""
+    global _style_initialized
+    if _style_initialized:
+        return
+    import seaborn as sns
+    sns.set_style("whitegrid")
+    _style_initialized = True
+
+
+def _downsample(x: np.ndarray, *ys: np.ndarray, max_pts: int = 2000) -> Tuple[np.ndarray, ...]:
+    """
+    Sous-échantillonne (par pas régulier) une série temporelle à au plus max_pts points
+    
+    Args:
+        x: Abscisses (pas de simulation)
+        ys: Une ou plusieurs séries de même longueur que x
+    
+    Returns:
+        (x, *ys) réduits, inchangés si la série est déjà assez courte
+    """
+    if len(x) <= max_pts:
+        return (x, *ys)
+    step = -(-len(x) // max_pts)  # arrondi supérieur : garantit len <= max_pts
+    return (x[::step], *(y[::step] for y in ys))
+
+
+@lru_cache(maxsize=16)
+def _palette(n: int) -> Tuple[Tuple[float, ...], ...]:
+    """Couleurs Set2 pour n séries (mises en cache, tuples RGBA immuables)"""
+    return tuple(map(tuple, plt.cm.Set2(np.linspace(0, 1, n))))
+
+
+def _stack_series(frames: List, column: str) -> np.ndarray:
+    """
+    Empile une colonne de plusieurs DataFrames en matrice (pas, séries)
+    Les séries plus courtes sont complétées par NaN (ligne interrompue).
+    """
+    length = max((len(df) for df in frames), default=0)
+    stacked = np.full((length, len(frames)), np.nan)
+    for j, df in enumerate(frames):
+        stacked[:len(df), j] = df[column].to_numpy()
+    return stacked
+
+
+@lru_cache(maxsize=32)
+def _format_summary(values: tuple) -> Tuple[str, str, str]:
+    """
+    Formate les textes du résumé (principal, gestionnaire de crise, scénarios)
+    Mis en cache : un rafraîchissement avec des statistiques inchangées ne reformate rien.
+    """
+    (created, arrived, active, travel_time, speed, congestion, queue,
+     interventions, green_waves, incidents,
+     rh_vehicles, inc_name, redirected, tt_before, tt_during) = values
+    summary_text = (
+        f"Véhicules créés : {created}\n"
+        f"Véhicules arrivés : {arrived}\n"
+        f"Véhicules actifs : {active}\n\n"
+        f"Temps de trajet moyen : {travel_time:.1f} s\n"
+        f"Vitesse moyenne : {speed*3.6:.1f} km/h\n"
+        f"Congestion : {congestion*100:.1f}%\n"
+        f"Files d'attente moy. : {queue:.1f} véh."
+    )
+    cm_text = (
+        f"Interventions : {interventions}\n"
+        f"Vagues vertes : {green_waves}\n"
+        f"Incidents actifs : {incidents}"
+    )
+    sc_text = (
+        f"Rush hour véhicules : {rh_vehicles}\n"
+        f"Incident : {inc_name}\n"
+        f"  Redirigés : {redirected}\n"
+        f"  Avant : {tt_before:.1f} s\n"
+        f"  Pendant : {tt_during:.1f} s"
+    )
+    return summary_text, cm_text, sc_text
+
+
+def _smooth(grid: np.ndarray, sigma: float = 1.0) -> np.ndarray:
+    """Lissage gaussien de la grille (SciPy si disponible, sinon convolution séparable numpy)"""
+    if SCIPY_AVAILABLE:
+        return gaussian_filter(grid, sigma=sigma)
+    radius = int(4.0 * sigma + 0.5)  # même troncature que scipy.ndimage
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    padded = np.pad(grid, radius, mode='symmetric')  # équivalent du mode 'reflect' de SciPy
+    rows = np.apply_along_axis(np.convolve, 0, padded, kernel, mode='valid')
+    return np.apply_along_axis(np.convolve, 1, rows, kernel, mode='valid')
 
 
 class TrafficVisualizer:
@@ -23,90 +131,208 @@ class TrafficVisualizer:
     """
     
     def __init__(self, model):
+        _init_style()
         self.model = model
         self.fig = None
         self.ax = None
+        # Coordonnées des nœuds du réseau (statique), recalculées si le nombre de nœuds change
+        self._node_xy = self._build_node_xy()
+        # Instantané (x, y) des véhicules actifs, reconstruit une fois par pas de simulation
+        self._vehicle_xy_cache = (np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32))
+        self._snapshot_step = None
+        # Figure d'animation (fond statique + véhicules animés)
+        self._anim_fig = None
+        self._anim_ax = None
+        self._vehicle_scat = None
     
-    def plot_network(self, save_path: str = None):
-        """Affiche le réseau routier"""
-        fig, ax = plt.subplots(figsize=(10, 10))
-        
+    def _build_node_xy(self) -> np.ndarray:
+        """Tableau (N, 2) float32 des positions des nœuds du réseau routier"""
+        nodes = self.model.road_network.nodes
+        return np.fromiter((node.position for node in nodes.values()),
+                           dtype=np.dtype((np.float32, 2)), count=len(nodes))
+    
+    def _node_positions(self) -> np.ndarray:
+        """Retourne les positions des nœuds en cache, invalidées si le réseau a changé"""
+        if len(self._node_xy) != len(self.model.road_network.nodes):
+            self._node_xy = self._build_node_xy()
+        return self._node_xy
+    
+    def _intersection_positions(self) -> np.ndarray:
+        """Tableau (N, 2) des positions des intersections"""
+        return np.fromiter((i.position for i in self.model.intersections),
+                           dtype=np.dtype((np.float64, 2)),
+                           count=len(self.model.intersections))
+    
+    def _active_positions(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retourne (xs, ys) des véhicules actifs, recalculés seulement si le pas a changé"""
+        if self._snapshot_step != self.model.current_step:
+            positions = [v.position for v in self.model.vehicles if v.active]
+            xy = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+            self._vehicle_xy_cache = (xy[:, 0], xy[:, 1])
+            self._snapshot_step = self.model.current_step
+        return self._vehicle_xy_cache
+    
+    def _marker_area(self, ax, radius: float) -> float:
+        """Convertit un rayon en mètres en aire de marqueur scatter (points²)"""
+        fig = ax.get_figure()
+        axes_width_pt = ax.get_position().width * fig.get_figwidth() * 72
+        radius_pt = radius * axes_width_pt / max(self.model.width, 1)
+        return (2 * radius_pt) ** 2  # s = diamètre² pour les marqueurs matplotlib
+    
+    def _network_axes(self):
+        """Réutilise la figure du réseau entre deux appels (animation) au lieu d'en recréer une"""
+        if self.fig is not None and plt.fignum_exists(self.fig.number):
+            self.ax.cla()
+        else:
+            self.fig, self.ax = plt.subplots(figsize=(10, 10))
+        return self.fig, self.ax
+    
+    def _draw_background(self, ax):
+        """Dessine la partie statique du réseau : nœuds, intersections, axes"""
         # Dessiner les nœuds
-        positions = [node.position for node in self.model.road_network.nodes.values()]
-        if positions:
-            x_coords, y_coords = zip(*positions)
-            ax.scatter(x_coords, y_coords, c='lightgray', s=10, alpha=0.5)
-        
-        # Dessiner les intersections
-        for intersection in self.model.intersections:
-            x, y = intersection.position
-            ax.add_patch(Circle((x, y), radius=50, color='red', alpha=0.7))
-            ax.text(x, y, 'I', ha='center', va='center', fontsize=8, color='white')
-        
-        # Dessiner les véhicules
-        for vehicle in self.model.vehicles:
-            if vehicle.active:
-                x, y = vehicle.position
-                ax.add_patch(Circle((x, y), radius=30, color='blue', alpha=0.8))
+        node_xy = self._node_positions()
+        if len(node_xy):
+            ax.scatter(node_xy[:, 0], node_xy[:, 1], c='lightgray', s=10, alpha=0.5,
+                       rasterized=True)
+        
+        # Dessiner les intersections (une seule collection, étiquettes en texte),
+        # au-dessus des véhicules pour que les étiquettes restent lisibles
+        inter_xy = self._intersection_positions()
+        if len(inter_xy):
+            ax.scatter(inter_xy[:, 0], inter_xy[:, 1], marker='o', s=self._marker_area(ax, 50),
+                       c='red', alpha=0.7, linewidths=0, zorder=2, rasterized=True)
+            for x, y in inter_xy:
+                ax.text(x, y, 'I', ha='center', va='center', fontsize=8, color='white',
+                        fontweight='bold', zorder=3)
         
         ax.set_xlim(0, self.model.width)
         ax.set_ylim(0, self.model.height)
         ax.set_xlabel('X (mètres)')
         ax.set_ylabel('Y (mètres)')
-        ax.set_title(f'Réseau de Trafic - Step {self.model.current_step}')
         ax.set_aspect('equal')
+    
+    def plot_network(self, save_path: str = None, dpi: int = 150):
+        """Affiche le réseau routier"""
+        fig, ax = self._network_axes()
+        self._draw_background(ax)
+        
+        # Dessiner les véhicules (une seule collection)
+        xs, ys = self._active_positions()
+        if len(xs):
+            ax.scatter(xs, ys, s=self._marker_area(ax, 30),
+                       c='blue', alpha=0.8, linewidths=0, rasterized=True)
+        
+        ax.set_title(f'Réseau de Trafic - Step {self.model.current_step}')
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✅ Réseau sauvegardé: {save_path}")
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig, ax
     
-    def plot_kpis(self, datacollector, save_path: str = None):
+    # ============ ANIMATION ============
+    
+    def init_anim(self):
+        """
+        Prépare l'animation : fond statique dessiné une fois, véhicules en artiste animé
+        
+        Returns:
+            Artistes redessinés à chaque image (blitting)
+        """
+        if self._anim_fig is None:
+            self._anim_fig, self._anim_ax = plt.subplots(figsize=(10, 10))
+            self._draw_background(self._anim_ax)
+            self._anim_ax.set_title('Réseau de Trafic')
+            self._vehicle_scat = self._anim_ax.scatter(
+                np.empty(0), np.empty(0), s=self._marker_area(self._anim_ax, 30),
+                c='blue', alpha=0.8, linewidths=0, animated=True
+            )
+        self._vehicle_scat.set_offsets(np.empty((0, 2)))
+        return (self._vehicle_scat,)
+    
+    def update_anim(self, frame):
+        """Avance le modèle d'un pas et déplace seulement les véhicules"""
+        self.model.step()
+        xs, ys = self._active_positions()
+        self._vehicle_scat.set_offsets(np.column_stack([xs, ys]))
+        return (self._vehicle_scat,)
+    
+    def animate(self, frames: int = 100, interval: int = 100, save_path: str = None):
+        """
+        Anime la simulation en ne redessinant que les véhicules (blit=True)
+        
+        Args:
+            frames: Nombre de pas de simulation animés
+            interval: Délai entre deux images (ms)
+            save_path: Fichier GIF de sortie (optionnel)
+        """
+        self.init_anim()
+        anim = animation.FuncAnimation(self._anim_fig, self.update_anim, frames=frames,
+                                       init_func=self.init_anim, interval=interval,
+                                       blit=True)
+        if save_path:
+            anim.save(save_path, writer='pillow', fps=max(1, 1000 // interval))
+            print(f"✅ Animation sauvegardée: {save_path}")
+        return anim
+    
+    def plot_kpis(self, datacollector, save_path: str = None, dpi: int = 150):
         """Génère les graphiques des KPIs"""
         df = datacollector.get_model_vars_dataframe()
         
+        # Extraire une seule fois les colonnes utiles en tableaux numpy
+        idx = df.index.to_numpy()
+        travel_time = df['Average_Travel_Time'].to_numpy()
+        queue_length = df['Average_Queue_Length'].to_numpy()
+        messages = df['Total_Messages'].to_numpy()
+        active = df['Active_Vehicles'].to_numpy()
+        speed_kmh = df['Average_Speed'].to_numpy() * 3.6
+        congestion_pct = df['Congestion_Level'].to_numpy() * 100.0
+        (idx, travel_time, queue_length, messages,
+         active, speed_kmh, congestion_pct) = _downsample(
+            idx, travel_time, queue_length, messages, active, speed_kmh, congestion_pct
+        )
+        
         fig, axes = plt.subplots(2, 3, figsize=(15, 10))
         fig.suptitle('Indicateurs de Performance (KPIs)', fontsize=16, fontweight='bold')
         
         # 1. Temps de trajet moyen
-        axes[0, 0].plot(df.index, df['Average_Travel_Time'], color='#2E86AB', linewidth=2)
+        axes[0, 0].plot(idx, travel_time, color='#2E86AB', linewidth=2)
         axes[0, 0].set_title('Temps de Trajet Moyen')
         axes[0, 0].set_xlabel('Pas de simulation')
         axes[0, 0].set_ylabel('Temps (secondes)')
         axes[0, 0].grid(True, alpha=0.3)
         
         # 2. Longueur des files
-        axes[0, 1].plot(df.index, df['Average_Queue_Length'], color='#A23B72', linewidth=2)
+        axes[0, 1].plot(idx, queue_length, color='#A23B72', linewidth=2)
         axes[0, 1].set_title('Longueur Moyenne des Files')
         axes[0, 1].set_xlabel('Pas de simulation')
         axes[0, 1].set_ylabel('Véhicules en attente')
         axes[0, 1].grid(True, alpha=0.3)
         
         # 3. Messages échangés
-        axes[0, 2].plot(df.index, df['Total_Messages'], color='#F18F01', linewidth=2)
+        axes[0, 2].plot(idx, messages, color='#F18F01', linewidth=2)
         axes[0, 2].set_title('Messages Échangés (Cumul)')
         axes[0, 2].set_xlabel('Pas de simulation')
         axes[0, 2].set_ylabel('Nombre de messages')
         axes[0, 2].grid(True, alpha=0.3)
         
         # 4. Véhicules actifs
-        axes[1, 0].plot(df.index, df['Active_Vehicles'], color='#6A994E', linewidth=2)
+        axes[1, 0].plot(idx, active, color='#6A994E', linewidth=2)
         axes[1, 0].set_title('Véhicules Actifs')
         axes[1, 0].set_xlabel('Pas de simulation')
         axes[1, 0].set_ylabel('Nombre de véhicules')
         axes[1, 0].grid(True, alpha=0.3)
         
         # 5. Vitesse moyenne
-        axes[1, 1].plot(df.index, df['Average_Speed'] * 3.6, color='#BC4749', linewidth=2)
+        axes[1, 1].plot(idx, speed_kmh, color='#BC4749', linewidth=2)
         axes[1, 1].set_title('Vitesse Moyenne')
         axes[1, 1].set_xlabel('Pas de simulation')
         axes[1, 1].set_ylabel('Vitesse (km/h)')
         axes[1, 1].grid(True, alpha=0.3)
         
         # 6. Niveau de congestion
-        axes[1, 2].plot(df.index, df['Congestion_Level'] * 100, color='#C1121F', linewidth=2)
+        axes[1, 2].plot(idx, congestion_pct, color='#C1121F', linewidth=2)
         axes[1, 2].set_title('Niveau de Congestion')
         axes[1, 2].set_xlabel('Pas de simulation')
         axes[1, 2].set_ylabel('Congestion (%)')
@@ -117,41 +343,41 @@ class TrafficVisualizer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✅ Graphiques KPIs sauvegardés: {save_path}")
         
         return fig, axes
     
-    def plot_heatmap_traffic(self, save_path: str = None):
+    def plot_heatmap_traffic(self, save_path: str = None, dpi: int = 150):
         """Génère une carte de chaleur du trafic"""
-        # Créer une grille
+        # Créer une grille (cases uniformes)
         grid_size = 50
-        x_bins = np.linspace(0, self.model.width, grid_size)
-        y_bins = np.linspace(0, self.model.height, grid_size)
-        
-        # Compter les véhicules dans chaque cellule
-        traffic_grid = np.zeros((grid_size - 1, grid_size - 1))
-        
-        for vehicle in self.model.vehicles:
-            if vehicle.active:
-                x, y = vehicle.position
-                x_idx = np.digitize(x, x_bins) - 1
-                y_idx = np.digitize(y, y_bins) - 1
-                
-                if 0 <= x_idx < grid_size - 1 and 0 <= y_idx < grid_size - 1:
-                    traffic_grid[y_idx, x_idx] += 1
+        bins = [grid_size - 1, grid_size - 1]
+        extent_range = [[0, self.model.height], [0, self.model.width]]
+        
+        # Compter les véhicules dans chaque cellule (une seule passe vectorisée)
+        xs, ys = self._active_positions()
+        if FAST_HISTOGRAM_AVAILABLE:
+            traffic_grid = histogram2d(ys, xs, range=extent_range, bins=bins)
+        elif NUMBA_AVAILABLE:
+            traffic_grid = bin_positions(xs, ys, float(self.model.width),
+                                         float(self.model.height), grid_size - 1)
+        else:
+            traffic_grid, _, _ = np.histogram2d(ys, xs, bins=bins, range=extent_range)
         
         # Créer la carte de chaleur
         fig, ax = plt.subplots(figsize=(10, 10))
         
-        im = ax.imshow(traffic_grid, cmap='YlOrRd', origin='lower', 
+        im = ax.imshow(_smooth(traffic_grid, sigma=1.0), cmap='YlOrRd', origin='lower', 
                       extent=[0, self.model.width, 0, self.model.height],
-                      aspect='auto', interpolation='bilinear')
+                      aspect='auto', interpolation='nearest')
+        im.set_rasterized(True)
         
-        # Ajouter les intersections
-        for intersection in self.model.intersections:
-            x, y = intersection.position
-            ax.plot(x, y, 'b*', markersize=15, markeredgecolor='white', markeredgewidth=1)
+        # Ajouter les intersections (une seule collection)
+        inter_xy = self._intersection_positions()
+        if len(inter_xy):
+            ax.scatter(inter_xy[:, 0], inter_xy[:, 1], marker='*', s=15 ** 2, c='blue',
+                       edgecolors='white', linewidths=1)
         
         plt.colorbar(im, ax=ax, label='Densité de véhicules')
         ax.set_xlabel('X (mètres)')
@@ -159,12 +385,12 @@ class TrafficVisualizer:
         ax.set_title('Carte de Chaleur du Trafic')
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✅ Carte de chaleur sauvegardée: {save_path}")
         
         return fig, ax
     
-    def create_comparison_plot(self, results_dict: dict, save_path: str = None):
+    def create_comparison_plot(self, results_dict: dict, save_path: str = None, dpi: int = 150):
         """
         Compare différentes configurations ou algorithmes
         
@@ -174,24 +400,35 @@ class TrafficVisualizer:
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
         fig.suptitle('Comparaison des Configurations', fontsize=16, fontweight='bold')
         
-        colors = plt.cm.Set2(np.linspace(0, 1, len(results_dict)))
+        colors = _palette(len(results_dict))
+        
+        names = list(results_dict.keys())
+        frames = list(results_dict.values())
+        
+        if frames:
+            # Une matrice (pas, configurations) par indicateur : un seul appel plot par axe
+            idx, travel_time, queue_length, speed, congestion = _downsample(
+                max(frames, key=len).index.to_numpy(),
+                _stack_series(frames, 'Average_Travel_Time'),
+                _stack_series(frames, 'Average_Queue_Length'),
+                _stack_series(frames, 'Average_Speed'),
+                _stack_series(frames, 'Congestion_Level')
+            )
+        
+            for ax in axes.flat:
+                ax.set_prop_cycle(color=colors)
         
-        for (name, df), color in zip(results_dict.items(), colors):
             # Temps de trajet
-            axes[0, 0].plot(df.index, df['Average_Travel_Time'], 
-                          label=name, linewidth=2, color=color)
-            
+            axes[0, 0].plot(idx, travel_time, label=names, linewidth=2)
+        
             # Files d'attente
-            axes[0, 1].plot(df.index, df['Average_Queue_Length'], 
-                          label=name, linewidth=2, color=color)
-            
+            axes[0, 1].plot(idx, queue_length, label=names, linewidth=2)
+        
             # Vitesse
-            axes[1, 0].plot(df.index, df['Average_Speed'] * 3.6, 
-                          label=name, linewidth=2, color=color)
-            
+            axes[1, 0].plot(idx, speed * 3.6, label=names, linewidth=2)
+        
             # Congestion
-            axes[1, 1].plot(df.index, df['Congestion_Level'] * 100, 
-                          label=name, linewidth=2, color=color)
+            axes[1, 1].plot(idx, congestion * 100.0, label=names, linewidth=2)
         
         # Configuration des axes
         axes[0, 0].set_title('Temps de Trajet Moyen')
@@ -219,12 +456,12 @@ class TrafficVisualizer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✅ Graphique de comparaison sauvegardé: {save_path}")
         
         return fig, axes
     
-    def plot_statistics_summary(self, stats: dict, save_path: str = None):
+    def plot_statistics_summary(self, stats: dict, save_path: str = None, dpi: int = 150):
         """Génère un résumé visuel des statistiques"""
         fig, axes = plt.subplots(2, 2, figsize=(12, 8))
         fig.suptitle('Résumé de la Simulation', fontsize=14, fontweight='bold')
@@ -234,18 +471,25 @@ class TrafficVisualizer:
         comm = stats.get('communication', {})
         cm = stats.get('crisis_manager', {})
 
+        # Textes formatés une seule fois pour des statistiques identiques
+        scenarios = stats.get('scenarios', {})
+        rh = scenarios.get('rush_hour', {})
+        inc = scenarios.get('incident', {})
+        summary_text, cm_text, sc_text = _format_summary((
+            sim['total_vehicles_created'], sim['total_vehicles_arrived'], sim['active_vehicles'],
+            perf['average_travel_time'], perf['average_speed'],
+            perf['congestion_level'], perf['average_queue_length'],
+            cm.get('interventions_count', 0), cm.get('green_waves_created', 0),
+            cm.get('active_incidents', 0),
+            rh.get('vehicles_created', 0), inc.get('name', 'N/A'),
+            inc.get('vehicles_redirected', 0),
+            inc.get('avg_travel_time_before_incident', 0),
+            inc.get('avg_travel_time_during_incident', 0)
+        ))
+
         # Panneau texte principal (ligne 0, colonnes 0-1)
         ax_text = axes[0, 0]
         ax_text.axis('off')
-        summary_text = (
-            f"Véhicules créés : {sim['total_vehicles_created']}\n"
-            f"Véhicules arrivés : {sim['total_vehicles_arrived']}\n"
-            f"Véhicules actifs : {sim['active_vehicles']}\n\n"
-            f"Temps de trajet moyen : {perf['average_travel_time']:.1f} s\n"
-            f"Vitesse moyenne : {perf['average_speed']*3.6:.1f} km/h\n"
-            f"Congestion : {perf['congestion_level']*100:.1f}%\n"
-            f"Files d'attente moy. : {perf['average_queue_length']:.1f} véh."
-        )
         ax_text.text(0.05, 0.95, summary_text, ha='left', va='top',
                      fontsize=11, family='monospace',
                      bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3),
@@ -268,11 +512,6 @@ class TrafficVisualizer:
         # Gestionnaire de crise
         ax_cm = axes[1, 0]
         ax_cm.axis('off')
-        cm_text = (
-            f"Interventions : {cm.get('interventions_count', 0)}\n"
-            f"Vagues vertes : {cm.get('green_waves_created', 0)}\n"
-            f"Incidents actifs : {cm.get('active_incidents', 0)}"
-        )
         ax_cm.text(0.05, 0.95, cm_text, ha='left', va='top',
                    fontsize=11, family='monospace',
                    bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.3),
@@ -282,16 +521,6 @@ class TrafficVisualizer:
         # Scénarios
         ax_sc = axes[1, 1]
         ax_sc.axis('off')
-        scenarios = stats.get('scenarios', {})
-        rh = scenarios.get('rush_hour', {})
-        inc = scenarios.get('incident', {})
-        sc_text = (
-            f"Rush hour véhicules : {rh.get('vehicles_created', 0)}\n"
-            f"Incident : {inc.get('name', 'N/A')}\n"
-            f"  Redirigés : {inc.get('vehicles_redirected', 0)}\n"
-            f"  Avant : {inc.get('avg_travel_time_before_incident', 0):.1f} s\n"
-            f"  Pendant : {inc.get('avg_travel_time_during_incident', 0):.1f} s"
-        )
         ax_sc.text(0.05, 0.95, sc_text, ha='left', va='top',
                    fontsize=11, family='monospace',
                    bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.3),
@@ -301,15 +530,18 @@ class TrafficVisualizer:
         plt.tight_layout()
 
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
             print(f"✅ Résumé sauvegardé: {save_path}")
 
         return fig
 
 
-def plot_all_visualizations(model, output_dir: str = "data/results"):
+def plot_all_visualizations(model, output_dir: str = "data/results", dpi: int = 150):
     """
     Génère toutes les visualisations
+    
+    Args:
+        dpi: Résolution des PNG (300 pour une version finale à imprimer)
     """
     import os
     os.makedirs(output_dir, exist_ok=True)
@@ -318,22 +550,20 @@ def plot_all_visualizations(model, output_dir: str = "data/results"):
     
     print("\n📊 Génération des visualisations...")
     
-    # 1. Réseau
-    visualizer.plot_network(save_path=f"{output_dir}/network.png")
-    
-    # 2. KPIs
-    visualizer.plot_kpis(model.datacollector, save_path=f"{output_dir}/kpis.png")
-    
-    # 3. Carte de chaleur
-    visualizer.plot_heatmap_traffic(save_path=f"{output_dir}/heatmap.png")
-    
-    # 4. Résumé
+    # Sauvegarde séquentielle (matplotlib n'est pas thread-safe), figure fermée aussitôt
     stats = model.get_statistics()
-    visualizer.plot_statistics_summary(stats, save_path=f"{output_dir}/summary.png")
+    plots = (
+        ('network', lambda: visualizer.plot_network()[0]),
+        ('kpis', lambda: visualizer.plot_kpis(model.datacollector)[0]),
+        ('heatmap', lambda: visualizer.plot_heatmap_traffic()[0]),
+        ('summary', lambda: visualizer.plot_statistics_summary(stats)),
+    )
+    for name, build in plots:
+        fig = build()
+        fig.savefig(f"{output_dir}/{name}.png", dpi=dpi, bbox_inches='tight')
+        plt.close(fig)
     
     print(f"✅ Toutes les visualisations générées dans {output_dir}/")
-    
-    plt.close('all')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+"""
+Noyau compilé (Numba) de comptage des véhicules par case pour la carte de chaleur
+Si Numba n'est pas installé, la fonction s'exécute en Python pur.
+"""
+import numpy as np
+
+# Import optionnel de Numba
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Remplaçant sans compilation de numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def bin_positions(xs, ys, width, height, n):
+    """
+    Compte les positions (xs, ys) dans une grille uniforme n x n couvrant [0, width[ x [0, height[
+
+    Returns:
+        Grille (n, n) indexée [ligne y, colonne x]
+    """
+    grid = np.zeros((n, n), dtype=np.float64)
+    sx = n / width
+    sy = n / height
+    for i in range(xs.shape[0]):
+        if xs[i] < 0.0 or ys[i] < 0.0:  # int() tronque vers zéro
+            continue
+        xi = int(xs[i] * sx)
+        yi = int(ys[i] * sy)
+        if 0 <= xi < n and 0 <= yi < n:
+            grid[yi, xi] += 1
+    return grid